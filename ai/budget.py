@@ -0,0 +1,149 @@
+from collections import Counter
+from models.article import Article
+from ai.rate_limit import estimate_tokens
+import math
+import re
+
+# Input tokens of article text allowed per summary; about 900 words,
+# plenty for a 100-word summary
+ARTICLE_TOKEN_BUDGET = 1200
+
+# Opening paragraphs always kept when they fit, as news leads carry the story
+LEAD_PARAGRAPHS = 2
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+(?=["\'“‘(\[]?[A-Z0-9])')
+WORD = re.compile(r"[a-z][a-z'’-]+")
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be because been but by can could did do does
+for from had has have he her his how i if in into is it its just like many may more most
+my no not of on one or other our out over said says she so some such than that the their
+them then there these they this those to up us was we were what when which who will with
+would you your
+""".split())
+
+
+def split_sentences(paragraph: str) -> list[str]:
+    """Split a paragraph into sentences on terminal punctuation."""
+    return [sentence for sentence in SENTENCE_END.split(paragraph.strip()) if sentence]
+
+
+def score_sentences(sentences: list[str]) -> list[float]:
+    """
+    Score sentences by how many of the text's frequent content words they hold.
+
+    A sentence's score is the summed document frequency of its
+    non-stopword words, divided by the square root of its length so long
+    sentences aren't favoured just for being long.
+
+    Args:
+        sentences (list[str]): Every sentence of the text.
+
+    Returns:
+        list[float]: One score per sentence.
+    """
+    words = [
+        [word for word in WORD.findall(sentence.lower()) if word not in STOPWORDS]
+        for sentence in sentences
+    ]
+    frequency = Counter(word for sentence_words in words for word in sentence_words)
+    return [
+        sum(frequency[word] for word in sentence_words) / math.sqrt(len(sentence_words))
+        if sentence_words else 0.0
+        for sentence_words in words
+    ]
+
+
+def trim_text(text: str, budget: int = ARTICLE_TOKEN_BUDGET) -> str:
+    """
+    Cut a text down to about `budget` tokens by extractive selection.
+
+    The lead paragraphs are kept, then the highest-scoring sentences of
+    the rest are added until the budget is spent. Selected sentences keep
+    their original order and paragraph breaks. Texts within budget are
+    returned unchanged. If nothing fits (e.g. one long unpunctuated
+    block, or text in a script without spaces), the first paragraph is
+    cut at about `budget` tokens' worth of characters instead.
+
+    Args:
+        text (str): The article text, paragraphs separated by newlines.
+        budget (int): Token budget, as counted by `estimate_tokens`.
+
+    Returns:
+        str: The trimmed text.
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+
+    paragraphs = [paragraph for paragraph in text.split("\n") if paragraph.strip()]
+
+    # --- Lead paragraphs ---
+    lead, used = [], 0
+    for paragraph in paragraphs[:LEAD_PARAGRAPHS]:
+        cost = estimate_tokens(paragraph)
+        if used + cost > budget:
+            break
+        lead.append(paragraph)
+        used += cost
+
+    # --- Best sentences of the rest, by score ---
+    sentences = [
+        (i, sentence)
+        for i, paragraph in enumerate(paragraphs[len(lead):], start=len(lead))
+        for sentence in split_sentences(paragraph)
+    ]
+    scores = score_sentences([sentence for _, sentence in sentences])
+    chosen = set()
+    for position in sorted(range(len(sentences)), key=lambda n: scores[n], reverse=True):
+        cost = estimate_tokens(sentences[position][1])
+        if used + cost <= budget:
+            chosen.add(position)
+            used += cost
+
+    if not lead and not chosen:
+        return paragraphs[0][:budget * 4]
+
+    # --- Reassemble in document order ---
+    body: dict[int, list[str]] = {}
+    for position in sorted(chosen):
+        paragraph, sentence = sentences[position]
+        body.setdefault(paragraph, []).append(sentence)
+
+    return "\n".join(lead + [" ".join(parts) for parts in body.values()])
+
+
+def apply_budget(articles: list[Article], budget: int = ARTICLE_TOKEN_BUDGET, report: bool = True) -> int:
+    """
+    Trim every article's text to the token budget before summarising.
+
+    Runs after deduplication, so fingerprints are taken from the full
+    text. Trimming is deterministic, so a resumed run sends the same text
+    and hits the summary cache.
+
+    Args:
+        articles (list[Article]): Articles about to be summarised; their
+            `text` is replaced in place.
+        budget (int): Token budget per article.
+        report (bool): Whether to print the tokens saved. Streaming callers
+            trim one article at a time and report the total themselves.
+
+    Returns:
+        int: Estimated input tokens saved.
+    """
+    before = after = trimmed = 0
+    for article in articles:
+        if not article.text:
+            continue
+        original = estimate_tokens(article.text)
+        article.text = trim_text(article.text, budget)
+        reduced = estimate_tokens(article.text)
+        before += original
+        after += reduced
+        trimmed += reduced < original
+
+    saved = before - after
+    if trimmed and report:
+        print(
+            f"Token budget: trimmed {trimmed} of {len(articles)} articles, "
+            f"~{saved} input tokens saved ({saved / before:.0%})."
+        )
+    return saved
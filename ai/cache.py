@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta
+from models.article import Article
+from data.store import DB_PATH
+import hashlib
+import json
+import sqlite3
+import threading
+
+TTL_DAYS = 30
+MAX_ENTRIES = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS summary_cache (
+    key        TEXT PRIMARY KEY,
+    summary    TEXT NOT NULL,
+    tags       TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    used_at    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_summary_cache_used_at ON summary_cache (used_at);
+"""
+
+
+def summary_key(template: str, model: str, text: str) -> str:
+    """
+    Build the cache key for one summarisation call.
+
+    Args:
+        template (str): The prompt template text.
+        model (str): The model name.
+        text (str): The article text.
+
+    Returns:
+        str: SHA-256 hex digest of the three parts.
+    """
+    digest = hashlib.sha256()
+    for part in (template, model, text or ""):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """
+    Persistent memo of AI summaries and tags.
+
+    Entries are keyed by the prompt template, model and article text, so
+    changing any of them naturally misses. Entries older than `ttl_days`
+    are ignored and purged, and only the `max_entries` most recently used
+    are kept. Hit and miss counts are kept for the current run.
+    """
+
+    def __init__(
+            self, template: str, model: str, path: str = DB_PATH,
+            ttl_days: int = TTL_DAYS, max_entries: int = MAX_ENTRIES):
+        self.template = template
+        self.model = model
+        self.ttl = timedelta(days=ttl_days)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.evict()
+
+    def _key(self, article: Article) -> str:
+        return summary_key(self.template, self.model, article.text)
+
+    def apply(self, article: Article) -> bool:
+        """
+        Fill in an article's summary and tags from the cache.
+
+        Args:
+            article (Article): The article to look up.
+
+        Returns:
+            bool: True on a hit (the article was updated), False on a miss.
+        """
+        key = self._key(article)
+        oldest = (datetime.now() - self.ttl).isoformat(timespec='seconds')
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT summary, tags FROM summary_cache WHERE key = ? AND created_at >= ?",
+                (key, oldest)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return False
+
+            self.hits += 1
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE summary_cache SET used_at = ? WHERE key = ?",
+                    (datetime.now().isoformat(timespec='seconds'), key)
+                )
+
+        article.summary = row[0]
+        article.tags = json.loads(row[1])
+        return True
+
+    def put(self, article: Article) -> None:
+        """
+        Store a summarised article's summary and tags.
+
+        Args:
+            article (Article): An article with `summary` and `tags` set.
+        """
+        if article.summary is None:
+            return
+
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock, self.conn:
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO summary_cache (key, summary, tags, created_at, used_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (self._key(article), article.summary, json.dumps(article.tags or []), now, now)
+            )
+
+    def evict(self) -> None:
+        """Purge expired entries and trim to the `max_entries` most recently used."""
+        oldest = (datetime.now() - self.ttl).isoformat(timespec='seconds')
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM summary_cache WHERE created_at < ?", (oldest,))
+            self.conn.execute(
+                """
+                DELETE FROM summary_cache WHERE key NOT IN (
+                    SELECT key FROM summary_cache ORDER BY used_at DESC LIMIT ?
+                )
+                """,
+                (self.max_entries,)
+            )
+
+    def stats(self) -> str:
+        return f"Summary cache: {self.hits} hits, {self.misses} misses."
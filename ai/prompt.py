@@ -1,11 +1,79 @@
 from google import genai
 from models.article import Article
+from utils.metrics import metrics
+import re
+import time
 
 # The client gets the API key from the environment variable `GEMINI_API_KEY`.
 # You must set your Google AI Studio API Key as an environment variable for this to work.
 
 client = genai.Client()
 
+MODEL = 'gemini-2.5-flash'
+SUM_TAG_TEMPLATE = 'ai/sum_tag.txt'
+SUM_TAG_BATCH_TEMPLATE = 'ai/sum_tag_batch.txt'
+TAGS = ["P2SA", "P2SB"]
+
+# Batches are capped by article count and combined text length
+BATCH_SIZE = 8
+BATCH_CHARS = 24000
+
+# Tolerates markdown decoration such as `**ARTICLE 2:**`
+ARTICLE_HEADER = re.compile(r'^[\s*#]*ARTICLE\s+(\d+)[\s*:]*$', re.MULTILINE)
+
+
+def generate(prompt: str, kind: str):
+    """
+    Send a prompt to the model, recording call latency and token usage.
+
+    Args:
+        prompt (str): The full prompt.
+        kind (str): Metrics label for the call, e.g. "sum_tag".
+
+    Returns:
+        The model response.
+    """
+    start = time.perf_counter()
+    try:
+        response = client.models.generate_content(
+            model=MODEL,
+            contents=prompt
+        )
+    finally:
+        metrics.observe("ai_call_seconds", time.perf_counter() - start, kind=kind)
+
+    usage = getattr(response, 'usage_metadata', None)
+    if usage is not None:
+        metrics.inc("ai_tokens_total", usage.prompt_token_count or 0, kind=kind, direction="input")
+        metrics.inc("ai_tokens_total", usage.candidates_token_count or 0, kind=kind, direction="output")
+    return response
+
+
+def parse_sum_tag(raw_text: str) -> (tuple[str, list[str]] | None):
+    """
+    Parse a SUMMARY/TAGS block from an AI response.
+
+    Args:
+        raw_text (str): Response text containing `SUMMARY:` and `TAGS:` sections.
+
+    Returns:
+        (tuple[str, list[str]] | None): The summary and tags, or None if the
+        text isn't in the expected format.
+    """
+    # Safer parsing using partition
+    if "SUMMARY:" not in raw_text or "TAGS:" not in raw_text:
+        return None
+
+    _, _, after_summary = raw_text.partition("SUMMARY:")
+    summary_block, _, tags_part = after_summary.partition("TAGS:")
+    summary_block = summary_block.strip()
+    tags_block = tags_part.strip()
+    if not (summary_block and tags_block):
+        return None
+
+    return summary_block, [tag.strip() for tag in tags_block.split(",")]
+
+
 def sum_tag_prompt(article: Article) -> bool:
     """
     Generate a 100-word summary and relevant tag(s) for an Article object 
@@ -18,31 +86,94 @@ def sum_tag_prompt(article: Article) -> bool:
     Returns:
         bool: True if summarisation and tagging succeeded, False if parsing the AI response failed.
     """
-    tags = ["P2SA", "P2SB"]
+    tags = TAGS
 
-    with open('ai/sum_tag.txt', 'r') as f:
+    with open(SUM_TAG_TEMPLATE, 'r') as f:
         prompt = f.read() % (f"{', '.join(tags)}", f"{article.text}")
 
-    response = client.models.generate_content(
-        model='gemini-2.5-flash',
-        contents=prompt
+    response = generate(prompt, "sum_tag")
+
+    parsed = parse_sum_tag(response.text.strip())
+    if parsed is None:
+        return False
+
+    article.summary, article.tags = parsed
+    return True
+
+
+def make_batches(
+        articles: list[Article], max_size: int = BATCH_SIZE,
+        max_chars: int = BATCH_CHARS) -> list[list[Article]]:
+    """
+    Group articles into batches for `sum_tag_batch_prompt`.
+
+    A batch is closed when it reaches `max_size` articles or when adding the
+    next article would push its combined text past `max_chars`, so many short
+    articles share one request while long ones travel in small batches.
+
+    Args:
+        articles (list[Article]): Articles to group, order is kept.
+        max_size (int): Maximum articles per batch.
+        max_chars (int): Maximum combined text length per batch.
+
+    Returns:
+        list[list[Article]]: The batches.
+    """
+    batches, batch, chars = [], [], 0
+    for article in articles:
+        length = len(article.text or "")
+        if batch and (len(batch) >= max_size or chars + length > max_chars):
+            batches.append(batch)
+            batch, chars = [], 0
+        batch.append(article)
+        chars += length
+
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def sum_tag_batch_prompt(articles: list[Article]) -> list[bool]:
+    """
+    Summarise and tag several articles in a single AI request.
+
+    The response is split back into per-article `ARTICLE <n>` sections and each
+    is parsed like a `sum_tag_prompt` response.
+
+    Args:
+        articles (list[Article]): The articles to summarise and tag.
+
+    Returns:
+        list[bool]: Per article, True if its section was found and parsed.
+        Callers should fall back to `sum_tag_prompt` for the False ones.
+    """
+    if len(articles) == 1:
+        return [sum_tag_prompt(articles[0])]
+
+    texts = "\n\n".join(
+        f"ARTICLE {i+1}\n{article.text}" for i, article in enumerate(articles)
     )
+    with open(SUM_TAG_BATCH_TEMPLATE, 'r') as f:
+        prompt = f.read() % (', '.join(TAGS), len(articles), texts)
+
+    response = generate(prompt, "sum_tag_batch")
 
     raw_text = response.text.strip()
 
-    # Safer parsing using partition
-    summary_block = tags_block = None
-    if "SUMMARY:" in raw_text and "TAGS:" in raw_text:
-        _, _, after_summary = raw_text.partition("SUMMARY:")
-        summary_block, _, tags_part = after_summary.partition("TAGS:")
-        summary_block = summary_block.strip()
-        tags_block = tags_part.strip()
-    else:
-        return False
+    # --- Split into per-article sections ---
+    sections = {}
+    headers = list(ARTICLE_HEADER.finditer(raw_text))
+    for header, following in zip(headers, headers[1:] + [None]):
+        end = following.start() if following else len(raw_text)
+        sections[int(header.group(1))] = raw_text[header.end():end]
 
-    article.summary = summary_block
-    article.tags = [tag.strip() for tag in tags_block.split(",")]
-    return True
+    results = []
+    for i, article in enumerate(articles):
+        parsed = parse_sum_tag(sections.get(i + 1, ""))
+        if parsed is not None:
+            article.summary, article.tags = parsed
+        results.append(parsed is not None)
+    return results
 
 def final_sum_prompt(articles: list[Article]):
     summaries = [f"{i+1}. " + article.summary for i, article in enumerate(articles)]
@@ -50,10 +181,7 @@ def final_sum_prompt(articles: list[Article]):
     with open('ai/final_sum.txt', 'r') as f:
         prompt = f.read() % ('\n'.join(summaries))
 
-    response = client.models.generate_content(
-        model='gemini-2.5-flash',
-        contents=prompt
-    )
+    response = generate(prompt, "final_sum")
 
     raw_text = response.text.strip()
 
@@ -0,0 +1,70 @@
+import threading
+import time
+
+# Gemini 2.5 Flash free tier limits
+REQUESTS_PER_MINUTE = 10
+TOKENS_PER_MINUTE = 250000
+
+# Rough size of the prompt instructions, on top of the article text
+PROMPT_OVERHEAD_TOKENS = 600
+
+
+def estimate_tokens(text: str | None) -> int:
+    """Cheap token estimate: about four characters per token for English text."""
+    return len(text or "") // 4 + 1
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    The bucket holds up to `capacity` tokens and refills continuously at
+    `capacity` tokens per `period` seconds. `acquire` blocks until enough
+    tokens are available, so callers are paced just under the limit
+    instead of bouncing off it.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1) -> None:
+        """
+        Take `amount` tokens, waiting for the bucket to refill if needed.
+        Requests larger than the bucket are clipped to its capacity.
+
+        Args:
+            amount (float): Number of tokens to take.
+        """
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """Client-side pacing for both requests-per-minute and tokens-per-minute quotas."""
+
+    def __init__(self, rpm: int = REQUESTS_PER_MINUTE, tpm: int = TOKENS_PER_MINUTE):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+
+    def acquire(self, tokens: int) -> None:
+        """
+        Wait until one more request of about `tokens` input tokens fits the quota.
+
+        Args:
+            tokens (int): Estimated input tokens of the request.
+        """
+        self.requests.acquire(1)
+        self.tokens.acquire(tokens)
@@ -1,10 +1,30 @@
-from ai.prompt import sum_tag_prompt
+from ai.prompt import (
+    sum_tag_prompt, sum_tag_batch_prompt, make_batches,
+    MODEL, SUM_TAG_TEMPLATE, SUM_TAG_BATCH_TEMPLATE, BATCH_SIZE, BATCH_CHARS
+)
+from ai.cache import SummaryCache
+from ai.rate_limit import RateLimiter, estimate_tokens, PROMPT_OVERHEAD_TOKENS
 from utils.safe_gen import safe_gen
+from utils.metrics import metrics
 from google.genai.errors import ClientError
 from tqdm import tqdm
 from models.article import Article
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Any
+from datetime import datetime
+import threading
 import time
 
+AI_WORKERS = 4
+
+# Articles held for a batch in streaming mode
+SUMMARY_QUEUE_SIZE = 16
+
+
+class DailyQuotaReached(Exception):
+    """Raised when the AI API reports that the daily quota is used up."""
+
+
 def handle_client_error(e: ClientError) -> bool:
     """
     Handle a ClientError from the AI call.
@@ -17,32 +37,304 @@ def handle_client_error(e: ClientError) -> bool:
         type_str = entry.get('@type', '')
         if type_str.endswith('QuotaFailure'):
             if 'PerDay' in entry['violations'][0]['quotaId']:
+                metrics.inc("ai_quota_errors_total", period="day")
                 return True  # stop processing
+            metrics.inc("ai_quota_errors_total", period="minute")
         elif type_str.endswith('RetryInfo'):
             retry_delay = int(entry['retryDelay'].rstrip('s'))
+            metrics.inc("retries_total", source="handle_client_error", reason="retry_info")
+            metrics.inc("sleep_seconds_total", retry_delay + 1, source="handle_client_error")
             time.sleep(retry_delay + 1)
     return False
 
-def throttle(processed_articles: list[Article], max_attempts: int = 5) -> bool:
+
+def open_summary_cache() -> SummaryCache:
+    """
+    Open the summary cache for the current prompts and model.
+
+    An article may be summarised with either the single or the batch
+    prompt, and which one isn't known until it's sent, so entries are
+    keyed on both templates: editing either one invalidates them.
+    """
+    templates = []
+    for path in (SUM_TAG_TEMPLATE, SUM_TAG_BATCH_TEMPLATE):
+        with open(path, 'r') as f:
+            templates.append(f.read())
+    return SummaryCache("\0".join(templates), MODEL)
+
+
+def call_with_retries(
+        func: Callable[..., Any], arg: Any, max_attempts: int,
+        limiter: RateLimiter | None = None, tokens: int = 0,
+        stop: threading.Event | None = None) -> Any:
+    """
+    Call an AI function through `safe_gen`, retrying on rate-limit errors.
+
+    Args:
+        func (Callable[..., Any]): The AI function to call.
+        arg (Any): Its single argument.
+        max_attempts (int): Max attempts for rate-limit errors.
+        limiter (RateLimiter | None): Client-side rate limiter to wait on before each attempt.
+        tokens (int): Estimated input tokens of one attempt, for the limiter.
+        stop (threading.Event | None): Set once any worker hits the daily quota.
+
+    Returns:
+        Any: The function's result, or None if every attempt was rate-limited.
+
+    Raises:
+        DailyQuotaReached: If the daily quota is used up, here or in another worker.
+    """
+    for _ in range(max_attempts):
+        if stop is not None and stop.is_set():
+            raise DailyQuotaReached()
+        if limiter is not None:
+            limiter.acquire(tokens)
+        try:
+            return safe_gen(func, arg)
+        except ClientError as e:
+            if handle_client_error(e):
+                if stop is not None:
+                    stop.set()
+                raise DailyQuotaReached() from e
+    return None
+
+
+def prompt_tokens(articles: list[Article]) -> int:
+    """Estimate the input tokens of one request for the given articles."""
+    return PROMPT_OVERHEAD_TOKENS + sum(estimate_tokens(article.text) for article in articles)
+
+
+def summarise_group(
+        group: list[Article], max_attempts: int, cache: SummaryCache,
+        limiter: RateLimiter, stop: threading.Event) -> None:
+    """
+    Summarise and tag one batch of articles, then cache the results.
+
+    Articles whose section of the batch response can't be parsed are
+    retried on their own.
+
+    Raises:
+        DailyQuotaReached: If the daily quota is used up.
+    """
+    if len(group) > 1:
+        results = call_with_retries(
+            sum_tag_batch_prompt, group, max_attempts,
+            limiter, prompt_tokens(group), stop)
+        results = results or [False] * len(group)
+    else:
+        results = [False]
+
+    for article, ok in zip(group, results):
+        if not ok:
+            ok = call_with_retries(
+                sum_tag_prompt, article, max_attempts,
+                limiter, prompt_tokens([article]), stop)
+        if ok:
+            cache.put(article)
+
+
+def throttle(
+        processed_articles: list[Article], max_attempts: int = 5,
+        cache: SummaryCache | None = None, batch: bool = True,
+        workers: int = AI_WORKERS, limiter: RateLimiter | None = None) -> bool:
     """
     Process a list of articles through the AI summarisation and tagging function,
-    handling quota limits and retry delays.
+    handling quota limits and retry delays. Articles already summarised with the
+    same prompt, model and text are served from the summary cache without an API call.
+
+    In batch mode, several articles are sent per request (see `make_batches`);
+    articles whose section of a batch response can't be parsed are retried
+    individually. Up to `workers` requests are in flight at once, paced by a
+    client-side token bucket so they stay just under the per-minute quotas.
+    If any worker hits the daily quota, the others stop before their next call.
 
     Args:
         processed_articles (list[Article]): List of Article objects to process.
-        max_attempts (int): Max retry attempts per article for transient errors.
+        max_attempts (int): Max retry attempts per request for transient errors.
+        cache (SummaryCache | None): Summary cache to use. Opens the default one if None.
+        batch (bool): Whether to summarise several articles per request.
+        workers (int): Number of concurrent AI requests.
+        limiter (RateLimiter | None): Rate limiter to use. Uses the default quotas if None.
 
     Returns:
         bool: False if daily quota is reached and processing must stop, True if all articles processed successfully.
     """
-    for article in tqdm(processed_articles, desc="Summarising and tagging articles"):
-        attempts = 0
-        while attempts < max_attempts:
-            try:
-                safe_gen(sum_tag_prompt, article)
-                break
-            except ClientError as e:
-                if handle_client_error(e):
-                    return False
-            attempts += 1
-    return True
\ No newline at end of file
+    if cache is None:
+        cache = open_summary_cache()
+    if limiter is None:
+        limiter = RateLimiter()
+
+    pending = [article for article in processed_articles if not cache.apply(article)]
+    batches = make_batches(pending) if batch else [[article] for article in pending]
+    stop = threading.Event()
+
+    def process(group: list[Article], progress: tqdm) -> None:
+        summarise_group(group, max_attempts, cache, limiter, stop)
+        progress.update(len(group))
+
+    try:
+        with tqdm(total=len(processed_articles), desc="Summarising and tagging articles") as progress:
+            progress.update(len(processed_articles) - len(pending))
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(process, group, progress) for group in batches]
+
+            for future in futures:
+                future.result()
+        return True
+    except DailyQuotaReached:
+        return False
+    finally:
+        print(cache.stats())
+
+
+class StreamSummariser:
+    """
+    Summarise articles as they arrive, while earlier pipeline stages are still running.
+
+    Articles are handed over with `submit` and held until `workers`
+    threads can send them in full batches (see `make_batches`), so they
+    share requests as they would after the pipeline. Until `close` says no
+    more articles are coming, only full batches of the newest waiting
+    articles are sent; the oldest batch's worth, the first to be evicted
+    from the top-N by newer arrivals, is held back until then, and the
+    rest go in the last batches. Articles for which `keep` returns False
+    (e.g. evicted from the top-N) are dropped while they wait. Cached
+    summaries are applied without a request. A batch that fails with any
+    other error is reported and left unsummarised, so one bad request
+    can't stop the workers and leave the producer waiting.
+    """
+
+    def __init__(
+            self, keep: Callable[[Article], bool] = lambda article: True,
+            max_attempts: int = 5, cache: SummaryCache | None = None,
+            workers: int = AI_WORKERS, limiter: RateLimiter | None = None,
+            queue_size: int = SUMMARY_QUEUE_SIZE):
+        if cache is None:
+            cache = open_summary_cache()
+        self.cache = cache
+        self.keep = keep
+        self.max_attempts = max_attempts
+        self.limiter = limiter or RateLimiter()
+        self.queue_size = queue_size
+        self.stop = threading.Event()
+        self.failed = 0
+        self._started = time.perf_counter()
+        self._waiting: list[Article] = []
+        self._closed = False
+        self._ready = threading.Condition()
+        self._progress = tqdm(desc="Summarising and tagging articles", unit=" articles", position=1)
+        self._threads = [
+            threading.Thread(target=self._work, name=f"summarise-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, article: Article) -> bool:
+        """
+        Queue an article for summarising, waiting while `queue_size` are waiting.
+
+        An article already waiting (e.g. evicted and then admitted again) is
+        not queued twice.
+
+        Returns:
+            bool: False once the daily quota has been reached; the article
+            is not queued and nothing more should be submitted.
+        """
+        with self._ready:
+            while not self.stop.is_set():
+                if not self._alive():
+                    raise RuntimeError("All summariser workers have exited.")
+                if any(waiting is article for waiting in self._waiting):
+                    return True
+                if len(self._waiting) >= self.queue_size:
+                    self._drop_evicted()
+                if len(self._waiting) < self.queue_size:
+                    self._waiting.append(article)
+                    self._ready.notify_all()
+                    return True
+                self._ready.wait(timeout=0.5)
+        return False
+
+    def _alive(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def _drop_evicted(self) -> None:
+        """Drop waiting articles that are no longer kept. Call with `_ready` held."""
+        kept = [article for article in self._waiting if self.keep(article)]
+        self._progress.update(len(self._waiting) - len(kept))
+        self._waiting = kept
+
+    def _take_batch(self) -> list[Article] | None:
+        """
+        Wait for the next batch of waiting articles that are still kept.
+
+        Returns:
+            list[Article] | None: The batch, or None once closed and empty.
+        """
+        with self._ready:
+            while True:
+                self._drop_evicted()
+                # Newest first; the oldest are the next to be evicted by newer
+                # arrivals, so a batch's worth of them waits for `close`
+                self._waiting.sort(key=lambda article: article.pub_date or datetime.min, reverse=True)
+                kept = self._waiting
+                settled = self._closed or self.stop.is_set()
+                candidates = kept if settled else kept[:-BATCH_SIZE]
+
+                group, chars, full = [], 0, False
+                for article in candidates:
+                    size = len(article.text or "")
+                    if len(group) == BATCH_SIZE or (group and chars + size > BATCH_CHARS):
+                        full = True
+                        break
+                    group.append(article)
+                    chars += size
+                full = full or len(group) == BATCH_SIZE or len(kept) >= self.queue_size
+
+                if group and (full or settled):
+                    del self._waiting[:len(group)]
+                    self._ready.notify_all()
+                    return group
+                if self._closed:
+                    return None
+                self._ready.wait()
+
+    def _work(self) -> None:
+        group = self._take_batch()
+        while group is not None:
+            if not self.stop.is_set():
+                pending = [article for article in group if not self.cache.apply(article)]
+                try:
+                    if pending:
+                        summarise_group(pending, self.max_attempts, self.cache, self.limiter, self.stop)
+                except DailyQuotaReached:
+                    self.stop.set()
+                    with self._ready:
+                        self._ready.notify_all()
+                except Exception as e:
+                    self.failed += len(pending)
+                    print(f"Failed to summarise {len(pending)} articles: {e!r}")
+            self._progress.update(len(group))
+            group = self._take_batch()
+
+    def close(self) -> bool:
+        """
+        Send the articles still waiting, wait for them and stop the workers.
+
+        Returns:
+            bool: False if the daily quota was reached, True otherwise.
+        """
+        with self._ready:
+            self._closed = True
+            self._ready.notify_all()
+        for thread in self._threads:
+            thread.join()
+        metrics.add_span("summarise", time.perf_counter() - self._started)
+        self._progress.close()
+        print(self.cache.stats())
+        if self.failed:
+            print(f"{self.failed} articles could not be summarised.")
+        return not self.stop.is_set()
+
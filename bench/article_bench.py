@@ -0,0 +1,146 @@
+"""
+Memory and throughput microbenchmark of the Article model.
+
+Compares the previous dict-backed Article, whose setters decoded HTML
+entities on every assignment, with the slotted `models.article.Article`
+that decodes lazily, on synthetic articles sized like our sources.
+
+Run from the repository root:
+
+    python -m bench.article_bench -n 5000
+"""
+from datetime import datetime, timedelta
+from models.article import Article
+import argparse
+import html
+import random
+import timeit
+import tracemalloc
+
+
+class OldArticle:
+    def __init__(self, title, link, pub_date, text=None, summary=None, tags=None, source=None):
+        self.title = title
+        self.link = link
+        self.pub_date = pub_date
+        self.text = text
+        self.summary = summary
+        self.tags = tags
+        self.source = source
+
+    @property
+    def title(self):
+        return self._title
+
+    @title.setter
+    def title(self, value):
+        self._title = html.unescape(value) if value else value
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = html.unescape(value) if value else value
+
+    @property
+    def summary(self):
+        return self._summary
+
+    @summary.setter
+    def summary(self, value):
+        self._summary = html.unescape(value) if value else value
+
+    def to_dict(self):
+        return {"title": self.title, "summary": self.summary, "link": self.link, "source": self.source}
+
+
+WORDS = "the language speakers word dialect grammar &amp; linguists &#8220;say&#8221; English".split()
+
+
+def synthetic(count: int, text_words: int) -> list[tuple]:
+    """
+    Raw fields for `count` articles, each with ~`text_words` words of text.
+
+    Title and text are kept encoded, as a response body is, so `build`
+    makes fresh strings that only the article holds on to.
+    """
+    rng = random.Random(0)
+    now = datetime.now()
+    return [
+        (
+            f"Why &#8216;OK&#8217; took over the world, part {i}".encode(),
+            f"https://example.com/{i}",
+            now - timedelta(hours=rng.randint(0, 400)),
+            "\n".join(" ".join(rng.choices(WORDS, k=60)) for _ in range(text_words // 60)).encode(),
+        )
+        for i in range(count)
+    ]
+
+
+def build(cls, rows: list[tuple]) -> list:
+    """Build articles from freshly decoded strings, as the scrapers do."""
+    return [cls(title.decode(), link, pub_date, text.decode()) for title, link, pub_date, text in rows]
+
+
+def measure_memory(cls, rows: list[tuple]) -> int:
+    """
+    Bytes held by the built articles: the objects and their strings.
+
+    The raw strings are dropped once each article is built, so an eagerly
+    decoded copy replaces its raw string rather than adding to it.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    articles = build(cls, rows)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del articles
+    return after - before
+
+
+def lifecycle(cls, rows: list[tuple]) -> None:
+    """Build every candidate, summarise the first 19, render them: a pipeline run."""
+    articles = build(cls, rows)
+    for article in articles[:19]:
+        article.summary = "A &quot;summary&quot; of the article."
+        article.tags = ["P2SA"]
+    [article.to_dict() for article in articles[:19]]
+
+
+def bench(label: str, func, number: int) -> float:
+    seconds = timeit.timeit(func, number=number) / number
+    print(f"  {label:<34}{seconds * 1000:8.2f} ms")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--count", type=int, default=5000, help="synthetic articles")
+    parser.add_argument("-w", "--words", type=int, default=900, help="words of text per article")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="runs per measurement")
+    args = parser.parse_args()
+
+    rows = synthetic(args.count, args.words)
+    print(f"{args.count} articles, ~{args.words} words each\n")
+
+    old, new = measure_memory(OldArticle, rows), measure_memory(Article, rows)
+    print("Memory held by the built articles")
+    print(f"  {'old, dict + eager unescape':<34}{old / 1024:8.0f} KiB")
+    print(f"  {'new, slots + lazy unescape':<34}{new / 1024:8.0f} KiB")
+    print(f"  {'saving':<34}{1 - new / old:8.0%}\n")
+
+    print("Build all, summarise and render 19")
+    old = bench("old", lambda: lifecycle(OldArticle, rows), args.repeat)
+    new = bench("new", lambda: lifecycle(Article, rows), args.repeat)
+    print(f"  {'speed-up':<34}{old / new:8.1f}x\n")
+
+    print("Build all and read every text")
+    old = bench("old", lambda: [article.text for article in build(OldArticle, rows)], args.repeat)
+    new = bench("new", lambda: [article.text for article in build(Article, rows)], args.repeat)
+    print(f"  {'speed-up':<34}{old / new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Microbenchmark of the HTML parsing paths used by the scrapers.
+
+Compares the old full `html.parser` parse against `utils.html_parse`
+(fastest available backend, scoped to the tags each scraper reads) on
+saved pages. Save a few listing and article pages from our sources first:
+
+    curl -o bench/pages/bbc_listing.html https://www.bbc.co.uk/future/tags/language/
+
+Run from the repository root:
+
+    python -m bench.parse_bench bench/pages/*.html
+"""
+from bs4 import BeautifulSoup, SoupStrainer
+from utils.html_parse import make_soup, extract_links, HTML_FEATURES, HTMLParser, CONTENT_PAGE, PAGE_BODY
+import argparse
+import timeit
+
+# Scoped to the title as well as the article, for comparison with CONTENT_PAGE
+ARTICLE_PAGE = SoupStrainer(['title', 'article'])
+
+
+def old_links(markup: str) -> list[str]:
+    soup = BeautifulSoup(markup, 'html.parser')
+    return [a.get('href') for a in soup.find_all('a') if a.get('href')]
+
+
+def old_article(markup: str) -> str:
+    soup = BeautifulSoup(markup, 'html.parser')
+    article_tag = soup.find('article') or soup
+    return "\n".join(p.get_text(strip=True) for p in article_tag.find_all('p'))
+
+
+def new_article(markup: str, strainer) -> str:
+    # Same work as `old_article`: the whole body when there's no <article>
+    article_tag = make_soup(markup, strainer).find('article') or make_soup(markup, PAGE_BODY)
+    return "\n".join(p.get_text(strip=True) for p in article_tag.find_all('p'))
+
+
+def bench(label: str, func, number: int) -> float:
+    seconds = timeit.timeit(func, number=number) / number
+    print(f"  {label:<34}{seconds * 1000:8.2f} ms")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="+", help="saved HTML pages")
+    parser.add_argument("-n", "--number", type=int, default=20, help="runs per measurement")
+    args = parser.parse_args()
+
+    print(f"Backend: {HTML_FEATURES}, selectolax: {'yes' if HTMLParser else 'no'}\n")
+
+    for path in args.pages:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            markup = f.read()
+        print(f"{path} ({len(markup) // 1024} KiB)")
+
+        old = bench("links, html.parser", lambda: old_links(markup), args.number)
+        new = bench("links, html_parse", lambda: extract_links(markup), args.number)
+        print(f"  {'speed-up':<34}{old / new:8.1f}x")
+
+        assert new_article(markup, CONTENT_PAGE) == old_article(markup), "scoped parse found different text"
+        old = bench("article text, html.parser", lambda: old_article(markup), args.number)
+        new = bench("article text, scoped (content)", lambda: new_article(markup, CONTENT_PAGE), args.number)
+        bench("article text, scoped (article)", lambda: new_article(markup, ARTICLE_PAGE), args.number)
+        print(f"  {'speed-up':<34}{old / new:8.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+from datetime import datetime
+from models.article import Article
+from data.loader import load_used_urls
+from utils.urls import canonical_url, url_aliases
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+DB_PATH = "data/articles.db"
+LEGACY_URLS_PATH = "data/urls.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url          TEXT PRIMARY KEY,
+    source       TEXT,
+    pub_date     TEXT,
+    content_hash TEXT,
+    used_at      TEXT,
+    summary      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_used_at ON articles (used_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS feed_state (
+    feed     TEXT PRIMARY KEY,
+    newest   TEXT,
+    seen_ids TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS url_aliases (
+    alias     TEXT PRIMARY KEY,
+    canonical TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_url_aliases_canonical ON url_aliases (canonical);
+"""
+
+# Columns added after the first release, created on open if missing
+MIGRATIONS = {
+    "title": "ALTER TABLE articles ADD COLUMN title TEXT",
+    "text": "ALTER TABLE articles ADD COLUMN text TEXT",
+    "feed": "ALTER TABLE articles ADD COLUMN feed TEXT",
+    "simhash": "ALTER TABLE articles ADD COLUMN simhash TEXT",
+    "canonical": "ALTER TABLE articles ADD COLUMN canonical TEXT",
+}
+
+
+def content_hash(text: str | None) -> (str | None):
+    """Return the SHA-256 hex digest of an article's text, or None if it has none."""
+    if not text:
+        return None
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ArticleStore:
+    """
+    Indexed local SQLite store of articles seen and used by the newsletter.
+
+    Replaces `data/urls.json`: membership checks are a primary-key lookup
+    instead of loading the whole list, and new rows are inserted
+    incrementally instead of rewriting the file. `url in store` is True
+    when the URL has already been used in a newsletter, so a store can be
+    passed anywhere a set of used URLs is expected.
+
+    The store is safe to share between the fetch worker threads.
+    """
+
+    def __init__(self, path: str = DB_PATH, legacy_path: str = LEGACY_URLS_PATH):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self._import_legacy(legacy_path)
+
+    def _migrate(self) -> None:
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(articles)")}
+        with self.conn:
+            for column, statement in MIGRATIONS.items():
+                if column not in columns:
+                    self.conn.execute(statement)
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_articles_feed ON articles (feed, pub_date)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_articles_canonical ON articles (canonical)"
+            )
+            # Rows recorded before URLs were canonicalised
+            rows = self.conn.execute("SELECT url FROM articles WHERE canonical IS NULL").fetchall()
+            self.conn.executemany(
+                "UPDATE articles SET canonical = ? WHERE url = ?",
+                [(canonical_url(url), url) for url, in rows]
+            )
+        url_aliases.load(dict(self.conn.execute("SELECT alias, canonical FROM url_aliases")))
+
+    def _save_aliases(self) -> None:
+        """Persist redirect and rel=canonical aliases found since the last save. Call with the lock held."""
+        if pending := url_aliases.take_pending():
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO url_aliases (alias, canonical) VALUES (?, ?)",
+                    pending.items()
+                )
+
+    def _import_legacy(self, legacy_path: str) -> None:
+        """One-time import of the used URL list from `urls.json`."""
+        with self._lock, self.conn:
+            done = self.conn.execute(
+                "SELECT 1 FROM meta WHERE key = 'imported_urls_json'"
+            ).fetchone()
+            if done or not os.path.exists(legacy_path):
+                return
+
+            imported_at = datetime.now().isoformat(timespec='seconds')
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO articles (url, used_at, canonical) VALUES (?, ?, ?)",
+                [(url, imported_at, canonical_url(url)) for url in load_used_urls(legacy_path)]
+            )
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('imported_urls_json', ?)",
+                (imported_at,)
+            )
+
+    def __contains__(self, url: str) -> bool:
+        return self.is_used(url)
+
+    def is_used(self, url: str) -> bool:
+        """
+        Check whether a URL has already been used in a newsletter.
+
+        URLs are compared in canonical form, so tracking parameters,
+        http/https, AMP variants and known redirects or rel=canonical
+        aliases of a used article all count as used.
+
+        Args:
+            url (str): The article URL.
+
+        Returns:
+            bool: True if the URL's page has a used-in-newsletter timestamp.
+        """
+        key = url_aliases.resolve(url)
+        with self._lock:
+            self._save_aliases()
+            row = self.conn.execute(
+                """
+                SELECT 1 FROM articles
+                WHERE used_at IS NOT NULL AND (
+                    canonical = ?
+                    OR canonical IN (SELECT alias FROM url_aliases WHERE canonical = ?)
+                )
+                """,
+                (key, key)
+            ).fetchone()
+        return row is not None
+
+    def record(self, articles: list[Article], feed: str | None = None) -> None:
+        """
+        Insert or update articles without changing their used status.
+
+        Text (and its hash) is only stored for feed candidates, as parsed
+        from the feed, since `candidates` is all it's needed for. Recording
+        articles later in the run, e.g. after their text has been trimmed
+        to the token budget, leaves the stored text and hash alone.
+
+        Args:
+            articles (list[Article]): Articles to record.
+            feed (str | None): Feed the articles came from, so they can be
+                offered again as candidates by `candidates`.
+        """
+        rows = [
+            (
+                article.link,
+                article.source,
+                article.pub_date.isoformat() if article.pub_date else None,
+                content_hash(text),
+                article.summary,
+                article.title,
+                text,
+                feed,
+                url_aliases.resolve(article.link)
+            )
+            for article in articles
+            for text in [article.text if feed else None]
+        ]
+        with self._lock, self.conn:
+            self._save_aliases()
+            self.conn.executemany(
+                """
+                INSERT INTO articles (url, source, pub_date, content_hash, summary, title, text, feed, canonical)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    canonical = excluded.canonical,
+                    source = excluded.source,
+                    pub_date = excluded.pub_date,
+                    content_hash = COALESCE(excluded.content_hash, content_hash),
+                    summary = COALESCE(excluded.summary, summary),
+                    title = COALESCE(excluded.title, title),
+                    text = COALESCE(excluded.text, text),
+                    feed = COALESCE(excluded.feed, feed)
+                """,
+                rows
+            )
+
+    def candidates(self, feed: str, since: datetime, exclude: set[str] = frozenset()) -> list[Article]:
+        """
+        Articles recorded from a feed on earlier runs that are still unused and recent.
+
+        Args:
+            feed (str): The feed URL.
+            since (datetime): Oldest publication date to return.
+            exclude (set[str]): URLs to leave out (e.g. those parsed this run),
+                compared in canonical form.
+
+        Returns:
+            list[Article]: The stored articles, newest first.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                """
+                SELECT url, title, pub_date, text, summary, source FROM articles
+                WHERE feed = ? AND used_at IS NULL AND pub_date >= ? AND title IS NOT NULL
+                ORDER BY pub_date DESC
+                """,
+                (feed, since.isoformat())
+            ).fetchall()
+
+        exclude = {url_aliases.resolve(url) for url in exclude}
+        return [
+            Article.from_record({
+                "link": url, "title": title, "pub_date": pub_date,
+                "text": text, "summary": summary, "source": source
+            })
+            for url, title, pub_date, text, summary, source in rows
+            if url_aliases.resolve(url) not in exclude
+        ]
+
+    def drop_stale_text(self, feed: str, since: datetime) -> None:
+        """
+        Forget the text of a feed's articles that `candidates` can no longer return.
+
+        Args:
+            feed (str): The feed URL.
+            since (datetime): The candidates' recency cutoff; text of
+                articles published before it, or already used, is cleared.
+        """
+        with self._lock, self.conn:
+            self.conn.execute(
+                """
+                UPDATE articles SET text = NULL
+                WHERE feed = ? AND text IS NOT NULL
+                    AND (pub_date IS NULL OR pub_date < ? OR used_at IS NOT NULL)
+                """,
+                (feed, since.isoformat())
+            )
+
+    def load_feed_state(self, feed: str) -> tuple[datetime | None, list[str]]:
+        """
+        Load a feed's high-water mark.
+
+        Args:
+            feed (str): The feed URL.
+
+        Returns:
+            tuple[datetime | None, list[str]]: The newest publication date seen
+            and the entry IDs seen, newest first. (None, []) for a new feed.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT newest, seen_ids FROM feed_state WHERE feed = ?", (feed,)
+            ).fetchone()
+        if row is None:
+            return None, []
+        return (datetime.fromisoformat(row[0]) if row[0] else None), json.loads(row[1])
+
+    def save_feed_state(self, feed: str, newest: datetime | None, seen_ids: list[str]) -> None:
+        """
+        Save a feed's high-water mark.
+
+        Args:
+            feed (str): The feed URL.
+            newest (datetime | None): The newest publication date seen.
+            seen_ids (list[str]): Entry IDs seen, newest first.
+        """
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO feed_state (feed, newest, seen_ids) VALUES (?, ?, ?)",
+                (feed, newest.isoformat() if newest else None, json.dumps(seen_ids))
+            )
+
+    def save_fingerprints(self, fingerprints: dict[str, int]) -> None:
+        """
+        Save the near-duplicate fingerprints of articles.
+
+        Args:
+            fingerprints (dict[str, int]): 64-bit SimHash fingerprints keyed by URL.
+        """
+        with self._lock, self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO articles (url, simhash, canonical) VALUES (?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET simhash = excluded.simhash
+                """,
+                [
+                    (url, f"{fingerprint:016x}", url_aliases.resolve(url))
+                    for url, fingerprint in fingerprints.items()
+                ]
+            )
+
+    def used_fingerprints(self, since: datetime) -> list[tuple[str, int]]:
+        """
+        Fingerprints of articles used in a newsletter since a given time.
+
+        Args:
+            since (datetime): Oldest use to include.
+
+        Returns:
+            list[tuple[str, int]]: (url, fingerprint) pairs.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT url, simhash FROM articles WHERE used_at >= ? AND simhash IS NOT NULL",
+                (since.isoformat(timespec='seconds'),)
+            ).fetchall()
+        return [(url, int(simhash, 16)) for url, simhash in rows]
+
+    def mark_used(self, articles: list[Article], when: datetime | None = None) -> None:
+        """
+        Record articles as used in a newsletter.
+
+        Args:
+            articles (list[Article]): Articles included in the newsletter.
+            when (datetime | None): Time of use. Defaults to now.
+        """
+        self.record(articles)
+        used_at = (when or datetime.now()).isoformat(timespec='seconds')
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "UPDATE articles SET used_at = ? WHERE url = ?",
+                [(used_at, article.link) for article in articles]
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
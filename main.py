@@ -1,60 +1,239 @@
 from dotenv import load_dotenv
 load_dotenv()
 from data.loader import load_feeds
+from data.store import ArticleStore
 from utils.banner import banner
 from utils.safe_gen import safe_gen
-from sources.rss_parser import process_all_rss
-from sources.hybrid_parser import process_all_hybrid
-from sources.non_rss_parser import process_all_non_rss
-from sources.prune import prune
-from ai.throttle import throttle
+from utils.safe_request import make_session
+from utils.host_limit import host_health
+from utils.parse_pool import configure_parse_pool
+from utils.metrics import metrics
+from utils.checkpoint import save_stage, completed_stages, clear_checkpoints
+from models.article import Article
+from sources.fetch import stream_feeds
+from sources.hybrid_parser import scrape_pending
+from sources.prune import TopN
+from sources.dedupe import DuplicateFilter
+from sources.dates import date_tier_stats
+from ai.throttle import throttle, StreamSummariser
+from ai.budget import apply_budget
 from ai.prompt import final_sum_prompt
 from cli.menu import menu
 from newsletter_email.context import generate_context
 from newsletter_email.render import render_newsletter
 from newsletter_email.send import send_email
-import requests
+import argparse
 import time
 
 ARTICLE_LIMIT = 19
 
-def main():
+
+def stream_articles(
+        feeds: tuple[list[str], list[str], list[str]], session,
+        store: ArticleStore) -> tuple[list[Article], bool]:
+    """
+    Fetch, filter and summarise articles in one overlapping pass.
+
+    Each feed's articles go through near-duplicate filtering, the top-N
+    limit, hybrid body scraping and the token budget as soon as the feed
+    finishes, and are then queued for the AI workers, so summarising
+    starts while later feeds are still downloading. Articles that already
+    have text are checked for duplicates before they take a slot; hybrid
+    articles once scraped. A slot freed by a failed scrape or a duplicate
+    is refilled from the top-N's reserve. Only the current top-N, its
+    reserve and the bounded queues hold articles. Once every feed is in,
+    the final top-N is checkpointed as "pruned" before waiting on the
+    remaining summaries, so a crash or quota stop can be resumed. If the
+    daily AI quota runs out, the remaining feeds are still fetched and
+    filtered, so that checkpoint covers every source.
+
+    Args:
+        feeds (tuple[list[str], list[str], list[str]]): RSS, hybrid and non-RSS feeds.
+        session (requests.Session): Active requests session for connection reuse.
+        store (ArticleStore): Used URLs, feed high-water marks and fingerprints.
+
+    Returns:
+        tuple[list[Article], bool]: The top ARTICLE_LIMIT articles, and
+        False if the daily AI quota ran out before all were summarised.
+    """
+    top = TopN(ARTICLE_LIMIT, store)
+    duplicates = DuplicateFilter(store)
+    summariser = StreamSummariser(keep=top.__contains__)
+    feed_results = stream_feeds(*feeds, session, store, store)
+    tokens_saved = 0
+    # Admitted articles still to be scraped and checked for duplicates
+    unchecked = []
+
+    def drop(article: Article) -> None:
+        refill = top.remove(article)
+        if refill is not None:
+            unchecked.append(refill)
+
+    try:
+        for feed_index, articles in feed_results:
+            ready = []
+            with metrics.span("prune"):
+                for position, article in enumerate(articles):
+                    order = (feed_index, position)
+                    replaced = None
+                    if article.text and top.admits(article, order):
+                        # Collapse copies of a story before they take up a slot
+                        keep, replaced = duplicates.offer(article)
+                        if not keep:
+                            continue
+                    ok, evicted = top.offer(article, order)
+                    if evicted is not None:
+                        duplicates.forget(evicted)
+                    if replaced is not None:
+                        drop(replaced)
+                    if ok:
+                        (ready if article.text else unchecked).append(article)
+
+            # Scrape the bodies of hybrid articles that made the cut, and of
+            # reserve articles refilling slots freed by failures or duplicates
+            while unchecked:
+                admitted = [article for article in unchecked if article in top]
+                unchecked.clear()
+                with metrics.span("scrape"):
+                    scraped = scrape_pending(admitted, session)
+                for article in set(admitted).difference(scraped):
+                    drop(article)
+                with metrics.span("prune"):
+                    for article in scraped:
+                        if article not in top:
+                            continue
+                        keep, replaced = duplicates.offer(article)
+                        if replaced is not None:
+                            drop(replaced)
+                        if not keep:
+                            drop(article)
+                            continue
+                        ready.append(article)
+
+            # An article evicted and refilled within the feed is listed twice
+            for article in dict.fromkeys(ready):
+                if article not in top:
+                    continue
+                with metrics.span("prune"):
+                    tokens_saved += apply_budget([article], report=False)
+                # Once the quota is out, articles are kept unsummarised for --resume
+                summariser.submit(article)
+
+        save_stage("pruned", {"articles": top.articles()})
+    finally:
+        feed_results.close()
+        finished = summariser.close()
+
+    selected = top.articles()
+    duplicates.save(selected)
+    if duplicates.removed:
+        print(f"Removed {duplicates.removed} near-duplicate articles.")
+    if tokens_saved:
+        print(f"Token budget: ~{tokens_saved} input tokens saved.")
+    return selected, finished
+
+
+def main(resume: bool = False, metrics_path: str | None = None):
+    if not metrics_path:
+        run(resume)
+        return
+
+    # Time stages and count requests, retries and AI usage for this run
+    metrics.reset()
+    metrics.enable()
+    try:
+        run(resume)
+    finally:
+        metrics.write(metrics_path)
+        print(f"Metrics written to {metrics_path}.")
+
+
+def run(resume: bool = False):
     # Load feeds
-    rss_feeds, hybrid_feeds, non_rss_feeds = load_feeds()
+    with metrics.span("load"):
+        feeds = load_feeds()
+        store = ArticleStore()
+
+    # Work out where to pick up from; later, unusable checkpoints are dropped
+    done = completed_stages() if resume else {}
+    clear_checkpoints(keep=done)
 
     # Startup text
     banner()
+    if done:
+        print(f"Resuming after the '{list(done)[-1]}' stage.\n")
+    elif resume:
+        print("No checkpoint to resume from, starting a new run.\n")
 
-    # Feed processing
-    with requests.Session() as session:
-        processed_articles = []
-        processed_articles.extend(process_all_rss(rss_feeds))
-        processed_articles.extend(process_all_hybrid(hybrid_feeds, session))  
-        processed_articles.extend(process_all_non_rss(non_rss_feeds, session))
-
-    # Prune used and excess articles (if any)
-    print()
-    print("Removing used articles...")
-    processed_articles = prune(processed_articles, ARTICLE_LIMIT)
-    print(f"Fetched {len(processed_articles)} articles.")
-    print()
-
-    # Summarising and tagging articles
-    print("Summarising and tagging articles...")
-    if not throttle(processed_articles):
-        print("Daily quota met, failed to perform AI tasks.")
-        return
+    # Fetching, filtering and summarising
+    # Summaries finished before an interruption come back from the summary cache
+    configure_parse_pool()
+    if "summarised" in done:
+        processed_articles = done["summarised"]["articles"]
+    else:
+        if "pruned" in done:
+            processed_articles = done["pruned"]["articles"]
+            print("Summarising and tagging articles...")
+            apply_budget(processed_articles)
+            with metrics.span("summarise"):
+                finished = throttle(processed_articles)
+        else:
+            with make_session() as session:
+                processed_articles, finished = stream_articles(feeds, session, store)
+            print(date_tier_stats.report())
+            if skipped := host_health.report():
+                print(skipped)
+            print(f"Fetched {len(processed_articles)} articles.")
+            print()
+
+        if not finished:
+            save_stage("pruned", {"articles": processed_articles})
+            print("Daily quota met, failed to perform AI tasks.")
+            print("Run again with --resume once the quota resets.")
+            return
+        store.record(processed_articles)
+        save_stage("summarised", {"articles": processed_articles})
 
     print("All articles fully processed and consolidated!")
-    time.sleep(1)
-    print("Preparing the selection menu...")
-    time.sleep(3)
-    selected_articles = menu(processed_articles)
-    title, summary = safe_gen(final_sum_prompt, selected_articles)
-    context = generate_context(title, summary, selected_articles)
-    html = render_newsletter(context)
-    send_email(html)
+
+    # Article selection
+    if "selected" in done:
+        selected_articles = done["selected"]["articles"]
+    else:
+        time.sleep(1)
+        print("Preparing the selection menu...")
+        time.sleep(3)
+        with metrics.span("select"):
+            selected_articles = menu(processed_articles)
+        save_stage("selected", {"articles": selected_articles})
+
+    # Newsletter generation
+    if "rendered" in done:
+        html = done["rendered"]["html"]
+    else:
+        with metrics.span("render"):
+            title, summary = safe_gen(final_sum_prompt, selected_articles)
+            context = generate_context(title, summary, selected_articles)
+            html = render_newsletter(context)
+        save_stage("rendered", {"html": html})
+    with metrics.span("send"):
+        send_email(html)
+
+    # Remember what went out so it isn't picked again
+    store.mark_used(selected_articles)
+    store.close()
+    clear_checkpoints()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Build and send the newsletter.")
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="continue from the last completed stage of an interrupted run"
+    )
+    parser.add_argument(
+        "--metrics", metavar="PATH",
+        help="write run metrics to PATH: a Prometheus textfile if it ends in .prom, JSON otherwise"
+    )
+    args = parser.parse_args()
+    main(resume=args.resume, metrics_path=args.metrics)
@@ -1,42 +1,71 @@
 from datetime import datetime, timedelta
 import html
 
+# Bits of `Article._decoded`, set once a field's HTML entities are decoded
+_TITLE, _TEXT, _SUMMARY = 1, 2, 4
+
+
 class Article:
+    """
+    A news article, from candidate through summary.
+
+    Slotted, so each instance holds its fields without a per-instance
+    `__dict__`. Title, text and summary are stored as assigned and their
+    HTML entities are decoded once, on first read, so text that is never
+    read (candidates pruned or evicted before summarising) is never
+    decoded, and assigning a field costs nothing.
+    """
+
+    __slots__ = ('_title', '_text', '_summary', '_decoded', 'link', 'pub_date', 'tags', 'source')
+
     def __init__(self, title, link, pub_date, text=None, summary=None, tags=None, source=None):
-        self.title = title
+        self._decoded = 0
+        self._title = title
+        self._text = text
+        self._summary = summary
         self.link = link
         self.pub_date = pub_date
-        self.text = text
-        self.summary = summary
         self.tags = tags
         self.source = source
 
+    def _decode(self, name, bit):
+        value = getattr(self, name)
+        if not self._decoded & bit:
+            if value:
+                value = html.unescape(value)
+                setattr(self, name, value)
+            self._decoded |= bit
+        return value
+
     # ---- title ----
     @property
     def title(self):
-        return self._title
+        return self._decode('_title', _TITLE)
 
     @title.setter
     def title(self, value):
-        self._title = html.unescape(value) if value else value
+        self._title = value
+        self._decoded &= ~_TITLE
 
     # ---- text ----
     @property
     def text(self):
-        return self._text
+        return self._decode('_text', _TEXT)
 
     @text.setter
     def text(self, value):
-        self._text = html.unescape(value) if value else value
+        self._text = value
+        self._decoded &= ~_TEXT
 
     # ---- summary ----
     @property
     def summary(self):
-        return self._summary
+        return self._decode('_summary', _SUMMARY)
 
     @summary.setter
     def summary(self, value):
-        self._summary = html.unescape(value) if value else value
+        self._summary = value
+        self._decoded &= ~_SUMMARY
 
     def to_dict(self):
         return {
@@ -46,6 +75,32 @@ class Article:
             "source": self.source
         }
 
+    def to_record(self):
+        """Full, JSON-serialisable copy of the article, for checkpoints."""
+        return {
+            "title": self.title,
+            "link": self.link,
+            "pub_date": self.pub_date.isoformat() if self.pub_date else None,
+            "text": self.text,
+            "summary": self.summary,
+            "tags": self.tags,
+            "source": self.source
+        }
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild an article saved with `to_record`."""
+        pub_date = record.get("pub_date")
+        article = cls(
+            record.get("title"), record["link"],
+            datetime.fromisoformat(pub_date) if pub_date else None,
+            record.get("text"), record.get("summary"),
+            record.get("tags"), record.get("source")
+        )
+        # Already decoded when saved, so never decode again
+        article._decoded = _TITLE | _TEXT | _SUMMARY
+        return article
+
     def is_recent(self, days=14):
         if self.pub_date:
             return self.pub_date > datetime.now() - timedelta(days=days)
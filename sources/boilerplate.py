@@ -0,0 +1,151 @@
+import re
+
+# Kept free of network imports, like sources/extract.py: runs in the
+# parse worker processes.
+
+# Subtrees that never hold body text
+BOILERPLATE_TAGS = frozenset({
+    'aside', 'button', 'figcaption', 'figure', 'footer', 'form', 'header',
+    'nav', 'noscript', 'script', 'style', 'template'
+})
+
+# class/id fragments of sign-up, share, related-story and caption blocks
+BOILERPLATE_HINT = re.compile(
+    r'caption|newsletter|subscri|sign-?up|related|recirc|promo|share|social|'
+    r'advert|byline|comment|cookie|footer|breadcrumb|more-on|read-more|onward',
+    re.IGNORECASE
+)
+
+# Paragraphs that are calls to action or credits rather than prose
+BOILERPLATE_TEXT = re.compile(
+    r'^(?:sign up|subscribe|related:|read more|more on this|photograph:|image:|'
+    r'follow us|share this|©|copyright)|(?:like|follow) us on (?:facebook|twitter|x|instagram)',
+    re.IGNORECASE
+)
+
+# Paragraphs mostly made of link text are navigation or "related" lists
+MAX_LINK_DENSITY = 0.5
+
+# Short paragraphs without sentence punctuation are labels, not prose
+MIN_WORDS = 6
+
+# Other blocks in the densest one's container are kept if they score at
+# least this share of it
+MIN_BLOCK_SHARE = 0.25
+
+WHITESPACE = re.compile(r'\s+')
+
+
+def _is_boilerplate_tag(tag) -> bool:
+    if tag.name in BOILERPLATE_TAGS:
+        return True
+    hints = " ".join([tag.get('id') or "", *(tag.get('class') or [])])
+    return bool(hints) and BOILERPLATE_HINT.search(hints) is not None
+
+
+def _in_boilerplate(paragraph, root, verdicts: dict[int, bool]) -> bool:
+    """Whether any ancestor of `paragraph` below `root` is boilerplate, memoised per tag."""
+    path = []
+    tag = paragraph
+    while tag is not None and tag is not root:
+        if id(tag) in verdicts:
+            found = verdicts[id(tag)]
+            break
+        path.append(tag)
+        tag = tag.parent
+    else:
+        found = False
+
+    # Walk back down, so each tag's verdict includes its ancestors'
+    for tag in reversed(path):
+        found = found or _is_boilerplate_tag(tag)
+        verdicts[id(tag)] = found
+    return found
+
+
+def _is_prose(text: str, link_chars: int) -> bool:
+    if not text or link_chars / len(text) > MAX_LINK_DENSITY:
+        return False
+    if BOILERPLATE_TEXT.search(text):
+        return False
+    return len(text.split()) >= MIN_WORDS or text[-1] in '.!?"”’'
+
+
+def _within(tag, block, root) -> bool:
+    """Whether `block` is a proper ancestor of `tag`, looking no higher than `root`."""
+    tag = tag.parent
+    while tag is not None:
+        if tag is block:
+            return True
+        if tag is root:
+            return False
+        tag = tag.parent
+    return False
+
+
+def main_text(root) -> str:
+    """
+    Extract clean body text from a parsed page or article container.
+
+    Paragraphs inside boilerplate subtrees (figures, asides, navigation,
+    and blocks whose class or id marks them as captions, sign-ups, share
+    bars or related stories) are dropped, as are paragraphs that are
+    mostly link text or read like a call to action.
+
+    The remaining paragraphs score their parent block by their non-link
+    text length, and their grandparent by half of it. Only paragraphs in
+    the highest-scoring block, or in other blocks of its container (its
+    grandparent) scoring a fair share of it, are kept. Body sections under
+    separate wrappers survive, while stray promo paragraphs around the
+    body are dropped.
+
+    Args:
+        root: A BeautifulSoup document or tag.
+
+    Returns:
+        str: The body paragraphs, in document order, joined by newlines.
+    """
+    verdicts: dict[int, bool] = {}
+    scores: dict[int, float] = {}
+    tags = {}
+    kept = []
+
+    for paragraph in root.find_all('p'):
+        if _in_boilerplate(paragraph, root, verdicts):
+            continue
+        text = WHITESPACE.sub(' ', paragraph.get_text()).strip()
+        link_chars = sum(len(WHITESPACE.sub(' ', a.get_text()).strip()) for a in paragraph.find_all('a'))
+        if not _is_prose(text, link_chars):
+            continue
+
+        kept.append((paragraph, text))
+        density = len(text) - link_chars
+        parent = paragraph.parent
+        for block, weight in ((parent, 1.0), (None if parent is root else parent.parent, 0.5)):
+            if block is not None:
+                tags[id(block)] = block
+                scores[id(block)] = scores.get(id(block), 0.0) + density * weight
+
+    if not kept:
+        return ""
+
+    top = tags[max(scores, key=scores.get)]
+    threshold = scores[id(top)] * MIN_BLOCK_SHARE
+
+    # The container shared by the body's sections: the top block's
+    # grandparent, or the root if that's nearer
+    container = top
+    for _ in range(2):
+        if container is root or container.parent is None:
+            break
+        container = container.parent
+
+    blocks = [top] + [
+        tag for key, tag in tags.items()
+        if tag is not top and scores[key] >= threshold and _within(tag, container, root)
+    ]
+
+    return "\n".join(
+        text for paragraph, text in kept
+        if any(_within(paragraph, block, root) for block in blocks)
+    )
@@ -0,0 +1,183 @@
+from datetime import datetime
+import json
+import re
+import threading
+import time
+
+# Tiers in the order they're tried; cheapest and most reliable first
+TIERS = ["time", "meta", "json_ld", "url", "text"]
+
+# Characters of article text the regex fallback may scan
+FALLBACK_WINDOW = 3000
+
+META_DATE_KEYS = (
+    "article:published_time", "og:article:published_time",
+    "datepublished", "pubdate", "publish-date", "parsely-pub-date"
+)
+
+URL_DATE_PATTERNS = [
+    re.compile(r'/(\d{4})/(\d{2})/(\d{2})/'),           # NPR: /2024/01/15/
+    re.compile(r'/((?:19|20)\d{2})(\d{2})(\d{2})[-/]')  # BBC: /article/20240115-
+]
+
+
+def parse_iso(value: str | None) -> (datetime | None):
+    """
+    Parse an ISO 8601 date or datetime into a naive local datetime,
+    so it compares with the naive dates used elsewhere.
+
+    Args:
+        value (str | None): The date string.
+
+    Returns:
+        (datetime | None): The parsed date, or None if it isn't ISO 8601.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def from_time_tag(container) -> (datetime | None):
+    """Date from the first `<time datetime>` inside the article container."""
+    for time_tag in container.find_all('time', attrs={'datetime': True}, limit=3):
+        if parsed := parse_iso(time_tag['datetime']):
+            return parsed
+    return None
+
+
+def from_meta(soup) -> (datetime | None):
+    """Date from `article:published_time` style meta tags."""
+    for meta in soup.find_all('meta', attrs={'content': True}):
+        key = (meta.get('property') or meta.get('name') or meta.get('itemprop') or '').lower()
+        if key in META_DATE_KEYS and (parsed := parse_iso(meta['content'])):
+            return parsed
+    return None
+
+
+def _find_date_published(data) -> (str | None):
+    if isinstance(data, list):
+        for item in data:
+            if found := _find_date_published(item):
+                return found
+    elif isinstance(data, dict):
+        if isinstance(data.get('datePublished'), str):
+            return data['datePublished']
+        for key in ('@graph', 'mainEntity', 'mainEntityOfPage'):
+            if found := _find_date_published(data.get(key)):
+                return found
+    return None
+
+
+def from_json_ld(soup) -> (datetime | None):
+    """Date from `datePublished` in JSON-LD script blocks."""
+    for script in soup.find_all('script', attrs={'type': 'application/ld+json'}):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+        if parsed := parse_iso(_find_date_published(data)):
+            return parsed
+    return None
+
+
+def from_url(url: str) -> (datetime | None):
+    """Date embedded in the article URL, as BBC and NPR do."""
+    for pattern in URL_DATE_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            try:
+                return datetime(*(int(part) for part in match.groups()))
+            except ValueError:
+                continue
+    return None
+
+
+def bounded_text(tag, limit: int) -> str:
+    """Concatenate a tag's text until `limit` characters, without building the whole string."""
+    parts, length = [], 0
+    for text in tag.strings:
+        parts.append(text)
+        length += len(text)
+        if length >= limit:
+            break
+    return "".join(parts)[:limit]
+
+
+class TierStats:
+    """Thread-safe tally of how often each date tier ran, hit, and how long it took."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = dict.fromkeys(TIERS, 0)
+        self.hits = dict.fromkeys(TIERS, 0)
+        self.seconds = dict.fromkeys(TIERS, 0.0)
+
+    def add(self, timings: dict[str, float], tier: str | None) -> None:
+        """
+        Record one extraction.
+
+        Args:
+            timings (dict[str, float]): Seconds spent per tier that ran.
+            tier (str | None): The tier that found the date, if any.
+        """
+        with self._lock:
+            for name, seconds in timings.items():
+                self.calls[name] += 1
+                self.seconds[name] += seconds
+            if tier:
+                self.hits[tier] += 1
+
+    def report(self) -> str:
+        lines = ["Date extraction tiers:"]
+        for name in TIERS:
+            if self.calls[name]:
+                average = self.seconds[name] / self.calls[name] * 1000
+                lines.append(
+                    f"  {name:<8}{self.hits[name]:>4}/{self.calls[name]:<4} hits, {average:.2f} ms avg"
+                )
+        return "\n".join(lines)
+
+
+date_tier_stats = TierStats()
+
+
+def extract_date(soup, container, url: str, text_tier) -> tuple[datetime | None, str | None, dict[str, float]]:
+    """
+    Find an article's publication date, trying cheap structured sources first.
+
+    Tiers, in order: `<time datetime>` in the container, published-time meta
+    tags, JSON-LD `datePublished`, a date in the URL, and finally `text_tier`
+    (the site's date selectors and bounded regex scan).
+
+    Args:
+        soup: The parsed page (must include <meta> and <script> tags).
+        container: The article container tag.
+        url (str): The article URL.
+        text_tier (Callable[[], datetime | None]): The last-resort extractor.
+
+    Returns:
+        tuple[datetime | None, str | None, dict[str, float]]: The date, the
+        tier that found it, and the seconds spent in each tier that ran.
+    """
+    tiers = {
+        "time": lambda: from_time_tag(container),
+        "meta": lambda: from_meta(soup),
+        "json_ld": lambda: from_json_ld(soup),
+        "url": lambda: from_url(url),
+        "text": text_tier,
+    }
+
+    timings = {}
+    for name in TIERS:
+        start = time.perf_counter()
+        found = tiers[name]()
+        timings[name] = time.perf_counter() - start
+        if found:
+            return found, name, timings
+    return None, None, timings
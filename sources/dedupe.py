@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta
+from models.article import Article
+import hashlib
+import re
+
+FINGERPRINT_BITS = 64
+SHINGLE_SIZE = 3
+
+# Fingerprints this many bits apart or fewer are the same story. Copies
+# with ~5% of their text changed land within 10 bits; unrelated texts
+# average 32 and practically never come within 16
+MAX_DISTANCE = 10
+
+# Words of text fingerprinted; enough to identify a story
+MAX_WORDS = 1500
+
+# How far back used articles are checked for re-publications
+REPUBLISH_DAYS = 180
+
+# Source names (as in feeds.json) kept over other copies of a story,
+# most preferred first. Otherwise the copy with the longest text is kept.
+PREFERRED_SOURCES: tuple[str, ...] = ()
+
+WORD = re.compile(r'\w+')
+
+
+def simhash(text: str) -> int:
+    """
+    64-bit SimHash of a text's word 3-gram shingles.
+
+    Texts that share most of their shingles get fingerprints that differ
+    in only a few bits, so copies of a story with different headers,
+    footers or small edits still land close together.
+
+    Args:
+        text (str): The article text.
+
+    Returns:
+        int: The fingerprint.
+    """
+    words = WORD.findall(text.lower())[:MAX_WORDS]
+    shingles = {
+        " ".join(words[i:i + SHINGLE_SIZE])
+        for i in range(max(len(words) - SHINGLE_SIZE + 1, 1))
+    }
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for shingle in shingles
+    ]
+
+    half = len(hashes) / 2
+    fingerprint = 0
+    for bit in range(FINGERPRINT_BITS):
+        mask = 1 << bit
+        if sum(1 for h in hashes if h & mask) > half:
+            fingerprint |= mask
+    return fingerprint
+
+
+def distance(a: int, b: int) -> int:
+    """Number of bits two fingerprints differ in."""
+    return (a ^ b).bit_count()
+
+
+def rank(article: Article, preferred: tuple[str, ...]) -> tuple[int, int]:
+    """Sort key for picking a cluster's representative; smallest wins."""
+    source_rank = preferred.index(article.source) if article.source in preferred else len(preferred)
+    return source_rank, -len(article.text or "")
+
+
+class DuplicateFilter:
+    """
+    Incremental near-duplicate filter.
+
+    Articles are offered one at a time and compared by SimHash distance
+    against the articles kept so far and, with a store, against stories
+    used in a newsletter in the last `REPUBLISH_DAYS`. Of two copies of a
+    story, the one from the most preferred source, or with the longest
+    text, is kept. Kept articles are held by reference alongside their
+    fingerprints, so the better copy can be reported as replacing them;
+    callers `forget` articles they drop, so only the current selection is
+    held.
+    """
+
+    def __init__(
+            self, store=None, preferred: tuple[str, ...] = PREFERRED_SOURCES,
+            max_distance: int = MAX_DISTANCE):
+        self.store = store
+        self.preferred = preferred
+        self.max_distance = max_distance
+        self.removed = 0
+        self._kept: dict[int, tuple[int, Article]] = {}
+        self._used: list[tuple[str, int]] = []
+        if store is not None:
+            self._used = store.used_fingerprints(datetime.now() - timedelta(days=REPUBLISH_DAYS))
+
+    def offer(self, article: Article) -> tuple[bool, Article | None]:
+        """
+        Offer an article.
+
+        Articles without text (hybrid candidates not yet scraped) are kept
+        without a fingerprint.
+
+        Args:
+            article (Article): A candidate article.
+
+        Returns:
+            tuple[bool, Article | None]: Whether to keep the article, and an
+            earlier article it replaces as the better copy of the story.
+        """
+        if not article.text:
+            return True, None
+        fingerprint = simhash(article.text)
+
+        if any(url != article.link and distance(fingerprint, other) <= self.max_distance
+               for url, other in self._used):
+            self.removed += 1
+            return False, None
+
+        for key, (other, kept) in self._kept.items():
+            if distance(fingerprint, other) <= self.max_distance:
+                self.removed += 1
+                if rank(article, self.preferred) < rank(kept, self.preferred):
+                    del self._kept[key]
+                    self._kept[id(article)] = (fingerprint, article)
+                    return True, kept
+                return False, None
+
+        self._kept[id(article)] = (fingerprint, article)
+        return True, None
+
+    def forget(self, article: Article) -> None:
+        """Stop comparing against an article dropped for another reason."""
+        self._kept.pop(id(article), None)
+
+    def save(self, articles: list[Article]) -> None:
+        """Save the fingerprints of the given kept articles to the store."""
+        if self.store is None:
+            return
+        self.store.save_fingerprints({
+            article.link: self._kept[id(article)][0]
+            for article in articles if id(article) in self._kept
+        })
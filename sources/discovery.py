@@ -0,0 +1,195 @@
+from datetime import datetime, timedelta
+from urllib.parse import urljoin, urlparse
+from xml.etree import ElementTree
+from bs4 import SoupStrainer
+from sources.dates import parse_iso
+from sources.incremental import entry_date, RECENT_DAYS
+from sources.profiles import SiteProfile
+from utils.html_parse import make_soup
+from utils.safe_request import safe_get, fetch_feed
+import requests
+
+FEED_TYPES = ("application/rss+xml", "application/atom+xml")
+DEFAULT_SITEMAPS = ("/news-sitemap.xml", "/sitemap_news.xml", "/sitemap.xml")
+
+# Child sitemaps of an index fetched per site, newest `lastmod` first
+MAX_CHILD_SITEMAPS = 4
+
+ALTERNATE_LINKS = SoupStrainer('link', rel='alternate', href=True)
+
+
+def _local(tag: str) -> str:
+    """Tag name without its XML namespace."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _child_text(element, name: str) -> (str | None):
+    """Text of the first descendant called `name`, in any namespace."""
+    for child in element.iter():
+        if _local(child.tag) == name and child.text:
+            return child.text.strip()
+    return None
+
+
+def feed_links(markup: bytes, base_url: str, encoding: str | None = None) -> list[str]:
+    """
+    Feeds a page advertises with `<link rel="alternate" type="application/rss+xml">`.
+
+    Args:
+        markup (bytes): The page HTML.
+        base_url (str): URL of the page, to resolve relative links.
+        encoding (str | None): Charset of `markup`.
+
+    Returns:
+        list[str]: Absolute feed URLs, in document order.
+    """
+    soup = make_soup(markup, ALTERNATE_LINKS, encoding)
+    return [
+        urljoin(base_url, link['href'])
+        for link in soup.find_all('link')
+        if (link.get('type') or '').lower() in FEED_TYPES
+    ]
+
+
+def from_feed(
+        url: str, session: requests.Session,
+        profile: SiteProfile) -> (list[tuple[str, datetime | None]] | None):
+    """
+    Candidates from an advertised feed.
+
+    Returns:
+        (list[tuple[str, datetime | None]] | None): Matching (url, date)
+        pairs, or None if the feed couldn't be read or had no articles.
+    """
+    feed = fetch_feed(url, session)
+    if feed is None:
+        return None
+    candidates = [
+        (entry.link, entry_date(entry))
+        for entry in feed.entries
+        if entry.get('link') and profile.matches(entry.link)
+    ]
+    return candidates or None
+
+
+def robots_sitemaps(domain: str, session: requests.Session) -> list[str]:
+    """
+    Sitemaps declared in a site's robots.txt, news sitemaps first.
+
+    Args:
+        domain (str): Scheme and host, e.g. "https://www.npr.org".
+        session (requests.Session): Active requests session for connection reuse.
+
+    Returns:
+        list[str]: Sitemap URLs.
+    """
+    response = safe_get(urljoin(domain, "/robots.txt"), session, retries=1, content_types=("text/plain",))
+    if response is None:
+        return []
+    sitemaps = [
+        line.split(':', 1)[1].strip()
+        for line in response.text.splitlines()
+        if line.lower().startswith('sitemap:')
+    ]
+    return sorted(sitemaps, key=lambda url: 'news' not in url.lower())
+
+
+def read_sitemap(
+        url: str, session: requests.Session) -> tuple[str | None, list[tuple[str, datetime | None]]]:
+    """
+    Fetch and parse one sitemap.
+
+    Args:
+        url (str): The sitemap URL.
+        session (requests.Session): Active requests session for connection reuse.
+
+    Returns:
+        tuple[str | None, list[tuple[str, datetime | None]]]: The root type
+        ("urlset" or "sitemapindex", None if unreadable) and its (loc, date)
+        entries. Dates come from `news:publication_date`, else `lastmod`.
+    """
+    response = safe_get(url, session, retries=1)
+    if response is None:
+        return None, []
+    try:
+        root = ElementTree.fromstring(response.content)
+    except ElementTree.ParseError:
+        return None, []
+
+    kind = _local(root.tag)
+    entries = []
+    for element in root:
+        loc = _child_text(element, 'loc')
+        if loc:
+            date = _child_text(element, 'publication_date') or _child_text(element, 'lastmod')
+            entries.append((loc, parse_iso(date)))
+    return kind, entries
+
+
+def from_sitemaps(
+        sitemaps: list[str], session: requests.Session, profile: SiteProfile,
+        days: int = RECENT_DAYS) -> (list[tuple[str, datetime | None]] | None):
+    """
+    Candidates from the first sitemap that lists articles of the site.
+
+    Sitemap indexes are followed into their most recently modified
+    children only; children whose `lastmod` is older than the recency
+    cutoff can't hold new articles and are never fetched.
+
+    Returns:
+        (list[tuple[str, datetime | None]] | None): Matching (url, date)
+        pairs, or None if no sitemap had any.
+    """
+    cutoff = datetime.now() - timedelta(days=days)
+
+    for sitemap in sitemaps:
+        kind, entries = read_sitemap(sitemap, session)
+        if kind == "sitemapindex":
+            children = sorted(
+                (entry for entry in entries if entry[1] is None or entry[1] >= cutoff),
+                key=lambda entry: entry[1] or datetime.min, reverse=True
+            )[:MAX_CHILD_SITEMAPS]
+            entries = []
+            for child, _ in children:
+                entries.extend(read_sitemap(child, session)[1])
+
+        candidates = [(loc, date) for loc, date in entries if profile.matches(loc)]
+        if candidates:
+            return candidates
+    return None
+
+
+def discover(
+        response: requests.Response, session: requests.Session,
+        profile: SiteProfile) -> (list[tuple[str, datetime | None]] | None):
+    """
+    Find a site's article URLs and dates without scraping the articles.
+
+    Tries, in order: feeds the listing page advertises, the site's
+    configured sitemaps, sitemaps declared in robots.txt, and the usual
+    sitemap locations. Only entries matching the profile's article
+    patterns count. These sources usually span the whole section or site,
+    so callers should only use the dates of articles the listing page
+    itself links to.
+
+    Args:
+        response (requests.Response): The fetched listing page.
+        session (requests.Session): Active requests session for connection reuse.
+        profile (SiteProfile): The site's compiled extraction profile.
+
+    Returns:
+        (list[tuple[str, datetime | None]] | None): (url, date) pairs, or
+        None if nothing was found.
+    """
+    for feed in feed_links(response.content, response.url, response.encoding):
+        if candidates := from_feed(feed, session, profile):
+            return candidates
+
+    parsed_url = urlparse(profile.url)
+    domain = f"{parsed_url.scheme}://{parsed_url.netloc}"
+    sitemaps = [
+        *profile.sitemaps,
+        *robots_sitemaps(domain, session),
+        *(urljoin(domain, path) for path in DEFAULT_SITEMAPS),
+    ]
+    return from_sitemaps(list(dict.fromkeys(sitemaps)), session, profile)
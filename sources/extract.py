@@ -0,0 +1,128 @@
+from datetime import datetime
+from utils.datefuncs import clean_ordinal_day
+from utils.html_parse import make_soup, CONTENT_PAGE, PAGE_BODY
+from sources.profiles import SiteProfile, DEFAULT_DATE_SELECTORS
+from sources.dates import extract_date, bounded_text, FALLBACK_WINDOW
+from sources.boilerplate import main_text
+from urllib.parse import urljoin
+from bs4 import SoupStrainer
+
+# Kept free of network and feed imports: these functions also run in the
+# parse worker processes (see utils/parse_pool.py) and only see raw bytes.
+
+
+def extract_pub_date(
+        tag, patterns, allow_fallback: bool = True,
+        selectors=tuple(DEFAULT_DATE_SELECTORS), window: int | None = None):
+    """Extract publication date from a BeautifulSoup tag using regex patterns.
+
+    Args:
+        tag: BeautifulSoup tag to search for date information.
+        patterns: (compiled regex, strptime format) pairs, as in
+            `SiteProfile.date_formats`.
+        allow_fallback (bool): If True, search entire tag text when no date element is found.
+        selectors: CSS selectors of dedicated date elements, tried in order.
+        window (int | None): If given, the fallback only scans this many
+            characters of the tag's text.
+
+    Returns:
+        datetime | None: Parsed publication date or None if not found.
+    """
+    # --- Check for dedicated date element ---
+    date_div = next(
+        (found for selector in selectors if (found := tag.select_one(selector))),
+        None
+    )
+    if date_div:
+        raw_text = date_div.get_text(strip=True)
+    else:
+        if not allow_fallback:
+            return None
+        raw_text = bounded_text(tag, window) if window else tag.get_text()
+
+    # --- Match against date patterns ---
+    for pattern in patterns:
+        match = pattern[0].search(raw_text)
+        if match:
+            cleaned = clean_ordinal_day(match.group())
+            return datetime.strptime(cleaned, pattern[1])
+    return None
+
+
+def extract_content(markup: bytes, encoding: str | None = None) -> str:
+    """Extract the body text of a page fetched for a hybrid feed entry.
+
+    Args:
+        markup (bytes): Raw page HTML.
+        encoding (str | None): Declared charset, if any.
+
+    Returns:
+        str: Body paragraphs from the <article>, or from the densest block
+        of the page if there is none, with boilerplate removed (see
+        `sources.boilerplate.main_text`), joined by newlines.
+    """
+    # --- Find the content root ---
+    # Only the <article> subtree is built; the whole <body> only if it has none
+    article_tag = make_soup(markup, CONTENT_PAGE, encoding).find('article')
+    root = article_tag or make_soup(markup, PAGE_BODY, encoding)
+
+    # --- Combine article text ---
+    return main_text(root)
+
+
+def extract_article(
+        markup: bytes, url: str, profile: SiteProfile,
+        encoding: str | None = None) -> (dict | None):
+    """Extract title, publication date and body text from an article page.
+
+    The date comes from the first tier of `sources.dates.extract_date` that
+    finds one; the site's date selectors and regexes are the last resort.
+
+    Args:
+        markup (bytes): Raw page HTML.
+        url (str): The article URL, which may contain the date.
+        profile (SiteProfile): The site's container, date selectors and formats.
+        encoding (str | None): Declared charset, if any.
+
+    Returns:
+        (dict | None): A compact record with `title`, `pub_date`, `text`,
+        `canonical` (the page's `rel=canonical` URL, or None), and the date
+        tier that matched with per-tier timings, or None if the page has
+        no <title> or article container.
+    """
+    # Only <title>, <link>, date-bearing <meta>/<script> and container
+    # subtrees are built, when the container selector names a tag
+    container_tag = profile.container_tag
+    strainer = SoupStrainer(['title', 'link', 'meta', 'script', container_tag]) if container_tag else None
+    soup = make_soup(markup, strainer, encoding)
+
+    # --- Extract title ---
+    title = soup.find('title')
+    if title is None:
+        return None
+
+    # --- Extract article content ---
+    article_tag = soup.select_one(profile.container)
+    if not article_tag:
+        return None
+
+    pub_date, date_tier, date_timings = extract_date(
+        soup, article_tag, url,
+        lambda: extract_pub_date(
+            article_tag, profile.date_formats, profile.allow_regex_fallback,
+            profile.date_selectors, FALLBACK_WINDOW)
+    )
+    text = main_text(article_tag)
+
+    canonical = soup.find('link', rel='canonical', href=True)
+
+    # Plain str, so the record doesn't drag the soup along when pickled
+    title_text = str(title.string) if title.string is not None else None
+    return {
+        "title": title_text,
+        "pub_date": pub_date,
+        "text": text,
+        "canonical": urljoin(url, canonical['href']) if canonical else None,
+        "date_tier": date_tier,
+        "date_timings": date_timings
+    }
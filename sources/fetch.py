@@ -0,0 +1,98 @@
+from typing import Container, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from models.article import Article
+from sources.rss_parser import process_rss
+from sources.hybrid_parser import process_hybrid
+from sources.non_rss_parser import process_non_rss
+from utils.host_limit import host_limiter
+from utils.metrics import metrics
+from tqdm import tqdm
+import queue
+import requests
+import threading
+import time
+
+FEED_WORKERS = 8
+PER_HOST_LIMIT = 2
+HOST_DELAY = 0.25
+
+# Finished feeds waiting to be consumed by `stream_feeds` callers
+FEED_QUEUE_SIZE = 4
+
+
+def feed_jobs(
+        rss_feeds: list[str], hybrid_feeds: list[str], non_rss_feeds: list[str],
+        used_urls: Container[str], state) -> list[tuple]:
+    """(process function, feed URL, extra arguments) for every feed, in feed order."""
+    return (
+        [(process_rss, feed, (used_urls, state)) for feed in rss_feeds]
+        + [(process_hybrid, feed, (used_urls, state)) for feed in hybrid_feeds]
+        + [(process_non_rss, feed, (used_urls,)) for feed in non_rss_feeds]
+    )
+
+
+def stream_feeds(
+        rss_feeds: list[str], hybrid_feeds: list[str], non_rss_feeds: list[str],
+        session: requests.Session, used_urls: Container[str] = frozenset(),
+        state=None, max_workers: int = FEED_WORKERS,
+        per_host: int = PER_HOST_LIMIT, delay: float = HOST_DELAY,
+        queue_size: int = FEED_QUEUE_SIZE) -> Iterator[tuple[int, list[Article]]]:
+    """Process every feed concurrently, yielding each feed's articles as soon as it finishes.
+
+    Each feed runs on its own worker, while the shared host limiter keeps
+    the number of simultaneous requests to any one host at `per_host`.
+    The caller can filter and summarise early feeds while later ones are
+    still downloading. Hybrid articles come back as candidates without
+    text; see `scrape_pending`. Finished feeds wait in a queue of
+    `queue_size`; when the caller falls behind, feed workers block
+    instead of piling up results. Closing the generator early stops the
+    remaining feeds.
+
+    Args:
+        rss_feeds (list[str]): RSS feed URLs.
+        hybrid_feeds (list[str]): Hybrid feed URLs.
+        non_rss_feeds (list[str]): Non-RSS listing page URLs.
+        session (requests.Session): Active requests session for connection reuse.
+        used_urls (Container[str]): URLs already used in a newsletter, skipped before fetching.
+        state: An ArticleStore with per-feed high-water marks, or None.
+        max_workers (int): Number of feeds processed at the same time.
+        per_host (int): Maximum concurrent requests to a single host.
+        delay (float): Minimum seconds between request starts to a single host.
+        queue_size (int): Finished feeds buffered for the caller.
+
+    Yields:
+        tuple[int, list[Article]]: The feed's index in feed order (RSS,
+        then hybrid, then non-RSS) and its articles, in completion order.
+    """
+    host_limiter.configure(per_host, delay)
+
+    jobs = feed_jobs(rss_feeds, hybrid_feeds, non_rss_feeds, used_urls, state)
+    results: queue.Queue[tuple[int, list[Article]]] = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def run(i, func, feed, args) -> None:
+        if stop.is_set():
+            return
+        try:
+            articles = func(feed, session, *args)
+        except Exception as e:
+            print(f"Failed to process {feed}: {e}")
+            articles = []
+        while not stop.is_set():
+            try:
+                results.put((i, articles), timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    start = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for i, (func, feed, args) in enumerate(jobs):
+            pool.submit(run, i, func, feed, args)
+        for _ in tqdm(range(len(jobs)), desc="Processing feeds"):
+            yield results.get()
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+        metrics.add_span("fetch", time.perf_counter() - start)
@@ -1,15 +1,18 @@
+from typing import Container
 from models.article import Article
 from datetime import datetime
-from bs4 import BeautifulSoup
-from tqdm import tqdm
-from utils.safe_request import safe_get
-from utils.add_source import add_source
+from utils.safe_request import safe_get, fetch_feed
+from sources.incremental import crawl_incrementally
+from utils.parse_pool import run_parse
+from sources.extract import extract_content
+from utils.pool import map_isolated
 import requests
-import feedparser
 import time
 
 def scrape_content(article: Article, session: requests.Session) -> bool:
     """Scrape the content an article from the website.
+    Parsing is handed to `extract_content`, in a worker process if the
+    parse pool is enabled.
 
     Args:
         article (Article): An article object.
@@ -20,27 +23,23 @@ def scrape_content(article: Article, session: requests.Session) -> bool:
     if response is None:
         return False
 
-    # --- Find paragraphs ---
-    soup = BeautifulSoup(response.text, 'html.parser')
-    article_tag = soup.find('article')
-    paragraphs = article_tag.find_all('p') if article_tag else soup.find_all('p')
-    
-    # --- Combine article text ---
-    text = "\n".join(p.get_text(strip=True) for p in paragraphs)
-    article.text = text
+    article.text = run_parse(extract_content, response.content, response.encoding)
     return True
 
 
-def parse_entry(entry, session: requests.Session) -> (Article | None):
-    """Parse a single Hybrid feed entry into an Article object.
+def parse_entry(entry) -> (Article | None):
+    """Parse a single Hybrid feed entry into a candidate Article object.
+
+    Only the feed metadata is read here. The article body is scraped later
+    by `scrape_pending`, once the candidate has survived pruning.
 
     Args:
         entry (feedparser.FeedParserDict): A single entry from an RSS feed.
-        session (requests.Session): Active requests session for connection reuse.
 
     Returns:
-        (Article | None): Returns an Article object if the entry has valid title, 
-        link, publication date. Returns None if any required field is missing.
+        (Article | None): Returns an Article object without text if the entry
+        has valid title, link, publication date. Returns None if any required
+        field is missing.
     """
     title = entry.get('title')
     link = entry.get('link')
@@ -50,57 +49,54 @@ def parse_entry(entry, session: requests.Session) -> (Article | None):
         return None
 
     pub_date = datetime.fromtimestamp(time.mktime(pub_date))
-    article = Article(title, link, pub_date)
-    
-    if not scrape_content(article, session):
-        return None
-
-    return article
+    return Article(title, link, pub_date)
 
 
-def process_hybrid(hybrid_feed_link: str, session: requests.Session) -> list[Article]:
-    """Process a single Hybrid feed URL and return a list of Article objects.
+def process_hybrid(
+        hybrid_feed_link: str, session: requests.Session,
+        used_urls: Container[str] = frozenset(), state=None) -> list[Article]:
+    """Process a single Hybrid feed URL and return a list of candidate Article objects.
+    Bodies are not scraped yet; see `scrape_pending`.
 
     Args:
         hybrid_feed_link (str): The URL of the Hybrid feed to process.
         session (requests.Session): Active requests session for connection reuse.
+        used_urls (Container[str]): URLs already used in a newsletter, skipped here.
+        state: An ArticleStore holding the feed's high-water mark. If given, only
+            entries newer than the mark are parsed and earlier candidates are
+            read back from the store (see `crawl_incrementally`).
 
     Returns:
         list[Article]: A list of Article objects parsed from the feed. 
-        Only includes articles that are recent (according to Article.is_recent()).
+        Only includes articles that are recent (according to Article.is_recent())
+        and not yet used.
     """
     try:
-        rss_feed = feedparser.parse(hybrid_feed_link)
+        rss_feed = fetch_feed(hybrid_feed_link, session)
     except Exception as e:
         return []
+
+    if rss_feed is None:
+        return []
     
-    articles = [
-        article
-        for entry in rss_feed.entries
-        if (article := parse_entry(entry, session)) is not None
-        and article.is_recent()
-    ]
-
-    add_source(articles, hybrid_feed_link)
-    
-    return articles
+    return crawl_incrementally(hybrid_feed_link, rss_feed.entries, parse_entry, used_urls, state)
 
 
-def process_all_hybrid(hybrid_feeds: list[str], session: requests.Session) -> list[Article]:
-    """Process a list of Hybrid feed URLs and return all recent articles.
+def scrape_pending(articles: list[Article], session: requests.Session) -> list[Article]:
+    """Scrape the bodies of candidate articles that don't have text yet.
+
+    Scrapes run in parallel on the shared article pool. Articles whose page
+    can't be fetched are dropped; articles that already have text are kept as is.
 
     Args:
-        hybrid_feeds (list[str]): A list of Hybrid feed URLs to process.
+        articles (list[Article]): Articles that survived pruning.
         session (requests.Session): Active requests session for connection reuse.
 
     Returns:
-        list[Article]: A combined list of Article objects from all feeds.
+        list[Article]: The articles that have text, in their original order.
     """
+    pending = [article for article in articles if article.text is None]
+    scraped = map_isolated(scrape_content, pending, session)
+    failed = {id(article) for article, ok in zip(pending, scraped) if not ok}
 
-    all_articles = []
-
-    for feed in tqdm(hybrid_feeds, desc="Processing hybrid feeds"):
-        articles = process_hybrid(feed, session)
-        all_articles.extend(articles)
-
-    return all_articles
\ No newline at end of file
+    return [article for article in articles if id(article) not in failed]
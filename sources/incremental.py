@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+from typing import Callable, Container
+from models.article import Article
+from utils.add_source import add_source
+import time
+
+RECENT_DAYS = 14
+MAX_SEEN_IDS = 500
+
+
+def entry_id(entry) -> (str | None):
+    """Stable identifier of a feed entry: its GUID/id, or its link if it has none."""
+    return entry.get('id') or entry.get('link')
+
+
+def entry_date(entry) -> (datetime | None):
+    """Publication date of a feed entry, if it has one."""
+    pub_date = entry.get('published_parsed')
+    return datetime.fromtimestamp(time.mktime(pub_date)) if pub_date else None
+
+
+def new_entries(entries, newest: datetime | None, seen: set[str], days: int = RECENT_DAYS) -> list:
+    """
+    Select the entries that haven't been processed on an earlier run.
+
+    Entries older than the recency cutoff are skipped, not taken as the
+    end of the feed, since feeds may pin an old post at the top or list
+    entries out of order. Scanning stops at the first entry that was
+    already seen and is not newer than the high-water mark.
+
+    Args:
+        entries: The feed's entries.
+        newest (datetime | None): Newest publication date seen on earlier runs.
+        seen (set[str]): Entry IDs seen on earlier runs.
+        days (int): Recency cutoff in days.
+
+    Returns:
+        list: The new entries, in feed order.
+    """
+    cutoff = datetime.now() - timedelta(days=days)
+    selected = []
+    for entry in entries:
+        pub_date = entry_date(entry)
+        if pub_date is not None and pub_date < cutoff:
+            continue
+        if entry_id(entry) in seen:
+            if newest is not None and pub_date is not None and pub_date <= newest:
+                break
+            continue
+        selected.append(entry)
+    return selected
+
+
+def crawl_incrementally(
+        feed_link: str, entries, parse: Callable[..., Article | None],
+        used_urls: Container[str], state=None, days: int = RECENT_DAYS) -> list[Article]:
+    """
+    Turn a feed's entries into candidate articles, doing work only for new entries.
+
+    Without a state store, every recent entry is parsed as before. With one,
+    only entries past the feed's high-water mark are parsed; they are
+    recorded in the store, the mark is moved forward, and the feed's
+    still-unused candidates from earlier runs are read back from the store.
+    Stored text of articles past the recency cutoff is dropped.
+
+    Args:
+        feed_link (str): The feed URL.
+        entries: The feed's entries.
+        parse (Callable[..., Article | None]): Builds an Article from one entry.
+        used_urls (Container[str]): URLs already used in a newsletter.
+        state: An ArticleStore, or None to parse every entry.
+        days (int): Recency cutoff in days.
+
+    Returns:
+        list[Article]: Recent, unused candidate articles from the feed.
+    """
+    newest, seen_ids = state.load_feed_state(feed_link) if state is not None else (None, [])
+    fresh = new_entries(entries, newest, set(seen_ids), days)
+
+    articles = [
+        article
+        for entry in fresh
+        if entry.get('link') not in used_urls
+        and (article := parse(entry)) is not None
+        and article.is_recent(days)
+    ]
+    add_source(articles, feed_link)
+
+    if state is None:
+        return articles
+
+    state.record(articles, feed=feed_link)
+
+    dates = [date for entry in fresh if (date := entry_date(entry)) is not None]
+    newest = max([newest, *dates], key=lambda d: d or datetime.min)
+    fresh_ids = [entry_id(entry) for entry in fresh if entry_id(entry)]
+    seen_ids = list(dict.fromkeys(fresh_ids + seen_ids))[:MAX_SEEN_IDS]
+    state.save_feed_state(feed_link, newest, seen_ids)
+
+    since = datetime.now() - timedelta(days=days)
+    state.drop_stale_text(feed_link, since)
+    previous = state.candidates(feed_link, since, exclude={article.link for article in articles})
+    return articles + previous
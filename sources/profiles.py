@@ -0,0 +1,95 @@
+from dataclasses import dataclass, field
+from data.loader import load_non_rss
+import re
+
+MONTHS = "January|February|March|April|May|June|July|August|September|October|November|December"
+MONTHS_SHORT = "Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec"
+
+# Used by sites that don't list their own `date_formats`
+DEFAULT_DATE_FORMATS = [
+    [rf'\d{{1,2}}(?:st|nd|rd|th) (?:{MONTHS}) \d{{4}}', '%d %B %Y'],
+    [rf'(?:{MONTHS}) \d{{1,2}}, \d{{4}}', '%B %d, %Y'],
+    [rf'\d{{1,2}} (?:{MONTHS_SHORT}) \d{{4}}', '%d %b %Y']
+]
+DEFAULT_CONTAINER = "article"
+DEFAULT_DATE_SELECTORS = ["div.published_at"]
+DEFAULT_MAX_LINKS = 40
+
+
+@dataclass(frozen=True)
+class SiteProfile:
+    """
+    Compiled extraction settings for one non-RSS source.
+
+    Built once from an entry of `data/non_rss.json`, so link and date
+    regexes are compiled a single time per run rather than per anchor or
+    per article. Profiles are plain picklable data and can be sent to the
+    parse worker processes.
+    """
+    url: str
+    link_patterns: tuple[re.Pattern, ...]
+    allow_regex_fallback: bool
+    container: str = DEFAULT_CONTAINER
+    date_selectors: tuple[str, ...] = tuple(DEFAULT_DATE_SELECTORS)
+    date_formats: tuple[tuple[re.Pattern, str], ...] = field(default=())
+    max_links: int = DEFAULT_MAX_LINKS
+    discovery: bool = True
+    sitemaps: tuple[str, ...] = ()
+
+    @property
+    def container_tag(self) -> (str | None):
+        """Tag name the container selector starts with, if any, for scoped parsing."""
+        match = re.match(r'[a-zA-Z][\w-]*', self.container)
+        return match.group().lower() if match else None
+
+    def matches(self, url: str) -> bool:
+        """Check whether a URL found on the listing page is an article of this site."""
+        return any(pattern.match(url) for pattern in self.link_patterns)
+
+
+def compile_profile(url: str, config: dict) -> SiteProfile:
+    """
+    Compile one `non_rss.json` entry into a SiteProfile.
+
+    Args:
+        url (str): The listing page URL (the entry's key).
+        config (dict): The entry. `article_regex` may be a string or a list;
+            every other key is optional.
+
+    Returns:
+        SiteProfile: The compiled profile.
+    """
+    link_regexes = config["article_regex"]
+    if isinstance(link_regexes, str):
+        link_regexes = [link_regexes]
+
+    date_formats = config.get("date_formats", DEFAULT_DATE_FORMATS)
+
+    return SiteProfile(
+        url=url,
+        link_patterns=tuple(re.compile(regex) for regex in link_regexes),
+        allow_regex_fallback=config.get("allow_regex_fallback", True),
+        container=config.get("container", DEFAULT_CONTAINER),
+        date_selectors=tuple(config.get("date_selectors", DEFAULT_DATE_SELECTORS)),
+        date_formats=tuple((re.compile(regex), fmt) for regex, fmt in date_formats),
+        max_links=config.get("max_links", DEFAULT_MAX_LINKS),
+        discovery=config.get("discovery", True),
+        sitemaps=tuple(config.get("sitemaps", ()))
+    )
+
+
+def load_site_profiles(path: str = "data/non_rss.json") -> dict[str, SiteProfile]:
+    """
+    Load and compile every non-RSS site profile.
+
+    Args:
+        path (str): Path to the non-RSS config.
+
+    Returns:
+        dict[str, SiteProfile]: Profiles keyed by listing page URL.
+    """
+    return {
+        url: compile_profile(url, config)
+        for url, config in load_non_rss(path).items()
+        if not url.startswith("_")
+    }
@@ -1,34 +1,137 @@
-from data.loader import load_used_urls
+from typing import Container
 from datetime import datetime
 from models.article import Article
+from utils.urls import url_aliases
+import heapq
+import itertools
+import threading
 
-def prune(processed_articles: list[Article], max_no: int) -> list[Article]:
-    """Prunes used articles and limit number of articles to max_no.
-    The limiting of articles is based on publish date or lack thereof.
 
-    Args:
-        processed_articles (list[Article]): A list of processed article objects
-        max_no (int): The maximum number of articles allowed
+class TopN:
+    """
+    The `max_no` newest unused articles, kept incrementally as feeds stream in.
 
-    Returns:
-        list[Article]: A list of articles that haven't been used. Total count is max_no.
+    Articles already used in a newsletter, and repeats of a canonical URL
+    (see `utils.urls.canonical_url`), are refused, and at most `max_no` of
+    the newest are held at a time. A newer article arriving when the set is
+    full evicts the oldest one, so the limit can be applied while feeds
+    are still downloading. Each article is offered with its feed index and
+    position in the feed, which break date ties and order the result, so
+    the articles held don't depend on which feed finished first.
+    Refused and evicted candidates are kept as a reserve of the
+    `reserve_no` next newest, so a slot freed with `remove` (a failed
+    scrape or a duplicate) is refilled from it. Membership checks are
+    thread-safe, so AI workers can skip articles evicted while they
+    waited in a queue.
     """
-    # --- Remove used articles ---
-    used_urls = load_used_urls()
-    i = 0
-    while i < len(processed_articles):
-        if processed_articles[i].link in used_urls:
-            processed_articles.pop(i)
-        else:
-            i += 1
-
-    # --- Limit to 20 or 19 articles ---
-    if len(processed_articles) > max_no:
-        print("Too many articles retrieved. Pruning excess...")
-        processed_articles.sort(
-            key=lambda a: a.pub_date or datetime.min, 
-            reverse=True
-        )
-        processed_articles = processed_articles[:max_no]
-
-    return processed_articles
\ No newline at end of file
+
+    def __init__(
+            self, max_no: int, used_urls: Container[str] = frozenset(),
+            reserve_no: int | None = None):
+        self.max_no = max_no
+        self.used_urls = used_urls
+        self.reserve_no = max_no if reserve_no is None else reserve_no
+        self._lock = threading.Lock()
+        # (date, -feed index, -position, arrival, id), oldest first
+        self._heap: list[tuple[datetime, int, int, int, int]] = []
+        self._members: dict[int, tuple[tuple[int, int], int, Article]] = {}
+        # (heap entry, article) of refused and evicted candidates, oldest first
+        self._reserve: list[tuple[tuple[datetime, int, int, int, int], Article]] = []
+        self._seen: set[str] = set()
+        self._arrival = itertools.count()
+
+    def offer(self, article: Article, order: tuple[int, int]) -> tuple[bool, Article | None]:
+        """
+        Offer an article for the set.
+
+        Args:
+            article (Article): A candidate article.
+            order (tuple[int, int]): Index of its feed in feed order, and its
+                position in that feed.
+
+        Returns:
+            tuple[bool, Article | None]: Whether the article was admitted (it
+            may still be evicted later by newer articles), and the article
+            it evicted, if any.
+        """
+        key = url_aliases.resolve(article.link)
+        if key in self._seen or article.link in self.used_urls:
+            return False, None
+        self._seen.add(key)
+
+        arrival = next(self._arrival)
+        entry = self._rank(article, order) + (arrival, id(article))
+        evicted = None
+        with self._lock:
+            self._discard_removed()
+            if len(self._members) >= self.max_no:
+                # Ties go to the article earlier in feed order
+                if entry[:3] <= self._heap[0][:3]:
+                    self._hold(entry, article)
+                    return False, None
+                oldest = heapq.heappop(self._heap)
+                evicted = self._members.pop(oldest[-1])[2]
+                self._hold(oldest, evicted)
+            heapq.heappush(self._heap, entry)
+            self._members[id(article)] = (order, arrival, article)
+        return True, evicted
+
+    def admits(self, article: Article, order: tuple[int, int]) -> bool:
+        """Whether `offer` would admit the article now, without offering it."""
+        if url_aliases.resolve(article.link) in self._seen or article.link in self.used_urls:
+            return False
+        with self._lock:
+            self._discard_removed()
+            return len(self._members) < self.max_no or self._rank(article, order) > self._heap[0][:3]
+
+    @staticmethod
+    def _rank(article: Article, order: tuple[int, int]) -> tuple[datetime, int, int]:
+        return article.pub_date or datetime.min, -order[0], -order[1]
+
+    def _hold(self, entry: tuple, article: Article) -> None:
+        """Keep a refused or evicted candidate in the reserve, dropping the oldest beyond `reserve_no`."""
+        heapq.heappush(self._reserve, (entry, article))
+        if len(self._reserve) > self.reserve_no:
+            heapq.heappop(self._reserve)
+
+    def _discard_removed(self) -> None:
+        """Pop heap entries of articles removed since they were pushed."""
+        while self._heap:
+            *_, arrival, key = self._heap[0]
+            member = self._members.get(key)
+            if member is not None and member[1] == arrival:
+                return
+            heapq.heappop(self._heap)
+
+    def remove(self, article: Article) -> Article | None:
+        """
+        Drop an admitted article (e.g. its page couldn't be scraped).
+
+        Returns:
+            Article | None: The newest reserve candidate, admitted in its
+            place, if any. It still needs the checks the dropped article
+            went through.
+        """
+        with self._lock:
+            if self._members.pop(id(article), None) is None or not self._reserve:
+                return None
+            best = max(range(len(self._reserve)), key=lambda i: self._reserve[i][0])
+            entry, promoted = self._reserve.pop(best)
+            heapq.heapify(self._reserve)
+            heapq.heappush(self._heap, entry)
+            self._members[id(promoted)] = ((-entry[1], -entry[2]), entry[3], promoted)
+            return promoted
+
+    def __contains__(self, article: Article) -> bool:
+        with self._lock:
+            return id(article) in self._members
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._members)
+
+    def articles(self) -> list[Article]:
+        """The articles held, in feed order."""
+        with self._lock:
+            return [article for _, _, article in sorted(self._members.values(), key=lambda member: member[0])]
+
@@ -1,8 +1,10 @@
+from typing import Container
 from models.article import Article
 from datetime import datetime
-from bs4 import BeautifulSoup
-from tqdm import tqdm
-from utils.add_source import add_source
+from sources.incremental import crawl_incrementally
+from utils.html_parse import html_to_text
+from utils.safe_request import fetch_feed
+import requests
 import feedparser
 import time
 
@@ -29,53 +31,36 @@ def parse_entry(entry: feedparser.FeedParserDict) -> (Article | None):
     if not content_html:
         return None
     
-    soup = BeautifulSoup(content_html, 'html.parser')
-    content = soup.get_text(strip=True)
+    content = html_to_text(content_html)
 
     return Article(title, link, pub_date, content)
 
 
-def process_rss(rss_feed_link: str) -> list[Article]:
+def process_rss(
+        rss_feed_link: str, session: requests.Session,
+        used_urls: Container[str] = frozenset(), state=None) -> list[Article]:
     """Process a single RSS feed URL and return a list of Article objects.
 
     Args:
         rss_feed_link (str): The URL of the RSS feed to process.
+        session (requests.Session): Active requests session for connection reuse.
+        used_urls (Container[str]): URLs already used in a newsletter, skipped here.
+        state: An ArticleStore holding the feed's high-water mark. If given, only
+            entries newer than the mark are parsed and earlier candidates are
+            read back from the store (see `crawl_incrementally`).
 
     Returns:
         list[Article]: A list of Article objects parsed from the feed. 
-        Only includes articles that are recent (according to Article.is_recent()).
+        Only includes articles that are recent (according to Article.is_recent())
+        and not yet used.
     """
     try:
-        rss_feed = feedparser.parse(rss_feed_link)
+        rss_feed = fetch_feed(rss_feed_link, session)
     except Exception as e:
         print(f"Failed to parse {rss_feed_link}: {e}")
         return []
-    
-    articles = [
-        article
-        for entry in rss_feed.entries
-        if (article := parse_entry(entry)) is not None
-        and article.is_recent()
-    ]
-
-    add_source(articles, rss_feed_link)
-
-    return articles
-
-
-def process_all_rss(rss_feeds: list) -> list[Article]:
-    """Process a list of RSS feed URLs and return all recent articles.
-
-    Args:
-        rss_feeds (list): A list of RSS feed URLs and source name pairs to process.
 
-    Returns:
-        list[Article]: A combined list of Article objects from all feeds.
-    """
-    all_articles = []
-
-    for feed in tqdm(rss_feeds, desc="Processing RSS feeds"):
-        articles = process_rss(feed)
-        all_articles.extend(articles)
-
-    return all_articles
\ No newline at end of file
+    if rss_feed is None:
+        return []
+    
+    return crawl_incrementally(rss_feed_link, rss_feed.entries, parse_entry, used_urls, state)
@@ -0,0 +1,108 @@
+from models.article import Article
+from typing import Any, Container
+import gzip
+import json
+import os
+
+CHECKPOINT_DIR = "data/checkpoints"
+
+# In pipeline order; a later stage supersedes the earlier ones on resume
+STAGES = ["pruned", "summarised", "selected", "rendered"]
+
+
+def _path(stage: str, path: str) -> str:
+    return os.path.join(path, f"{stage}.json.gz")
+
+
+def save_stage(stage: str, payload: dict[str, Any], path: str = CHECKPOINT_DIR) -> None:
+    """
+    Write a stage's output to a gzipped JSON checkpoint.
+
+    Articles in the payload (under the `articles` key, or any key ending in
+    `_articles`) are stored with `Article.to_record`.
+
+    Args:
+        stage (str): One of STAGES.
+        payload (dict[str, Any]): The stage output.
+        path (str): Checkpoint directory.
+    """
+    data = {
+        key: [article.to_record() for article in value]
+        if key == "articles" or key.endswith("_articles") else value
+        for key, value in payload.items()
+    }
+
+    os.makedirs(path, exist_ok=True)
+    tmp_path = _path(stage, path) + ".tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp_path, _path(stage, path))
+
+
+def load_stage(stage: str, path: str = CHECKPOINT_DIR) -> (dict[str, Any] | None):
+    """
+    Read a stage checkpoint written by `save_stage`.
+
+    Args:
+        stage (str): One of STAGES.
+        path (str): Checkpoint directory.
+
+    Returns:
+        (dict[str, Any] | None): The stage output with articles rebuilt,
+        or None if the stage has no checkpoint.
+    """
+    try:
+        with gzip.open(_path(stage, path), 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    return {
+        key: [Article.from_record(record) for record in value]
+        if key == "articles" or key.endswith("_articles") else value
+        for key, value in data.items()
+    }
+
+
+def completed_stages(path: str = CHECKPOINT_DIR) -> dict[str, dict[str, Any]]:
+    """
+    Load the checkpoints of the stages an interrupted run completed.
+
+    Stages are read in pipeline order and the first missing or unreadable
+    checkpoint ends the run of completed stages, since each stage is
+    resumed from the output of the ones before it. Unreadable checkpoints
+    are reported.
+
+    Args:
+        path (str): Checkpoint directory.
+
+    Returns:
+        dict[str, dict[str, Any]]: Stage outputs keyed by stage, in STAGES
+        order; empty if there is nothing to resume.
+    """
+    completed = {}
+    for stage in STAGES:
+        data = load_stage(stage, path)
+        if data is None:
+            if os.path.exists(_path(stage, path)):
+                print(f"The '{stage}' checkpoint can't be read; resuming from the stage before it.")
+            break
+        completed[stage] = data
+    return completed
+
+
+def clear_checkpoints(path: str = CHECKPOINT_DIR, keep: Container[str] = ()) -> None:
+    """
+    Delete stage checkpoints, e.g. after a successful run.
+
+    Args:
+        path (str): Checkpoint directory.
+        keep (Container[str]): Stages whose checkpoints are kept.
+    """
+    for stage in STAGES:
+        if stage in keep:
+            continue
+        try:
+            os.remove(_path(stage, path))
+        except OSError:
+            pass
@@ -0,0 +1,142 @@
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from utils.metrics import metrics
+import threading
+import time
+
+
+class HostLimiter:
+    """
+    Cap the number of in-flight requests made to any single host.
+
+    Each host gets its own bounded semaphore, so a slow host can only
+    tie up `per_host` workers while requests to other hosts carry on.
+    Request starts to the same host are also spaced at least `delay`
+    seconds apart, to stay polite and avoid being rate-limited.
+    """
+
+    def __init__(self, per_host: int = 2, delay: float = 0.0):
+        self.per_host = per_host
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._slots: dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: dict[str, float] = {}
+
+    def configure(self, per_host: int, delay: float = 0.0) -> None:
+        """
+        Change the per-host cap and politeness delay. Only takes effect for
+        hosts not yet seen, so call this before any requests are made.
+
+        Args:
+            per_host (int): Maximum concurrent requests per host.
+            delay (float): Minimum seconds between request starts per host.
+        """
+        with self._lock:
+            self.per_host = per_host
+            self.delay = delay
+            self._slots.clear()
+            self._next_start.clear()
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host)
+                self._slots[host] = slot
+            return slot
+
+    def _wait_turn(self, host: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.delay
+        if start > now:
+            metrics.inc("sleep_seconds_total", start - now, source="host_limiter")
+            time.sleep(start - now)
+
+    @contextmanager
+    def limit(self, url: str):
+        """
+        Hold one of the host's request slots for the duration of the block.
+
+        Args:
+            url (str): URL about to be requested.
+        """
+        host = urlparse(url).netloc
+        with self._slot(host):
+            if self.delay:
+                self._wait_turn(host)
+            yield
+
+
+host_limiter = HostLimiter()
+
+
+class HostHealth:
+    """
+    Per-host circuit breaker for the current run.
+
+    After `threshold` consecutive failed requests (URLs that timed out,
+    couldn't connect or replied 5xx once their retries were used up) a
+    host's circuit opens and every later request to it is
+    skipped immediately, instead of each URL paying its own timeouts and
+    backoff sleeps. A success resets the host's failure count.
+    """
+
+    def __init__(self, threshold: int = 3):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._failures: dict[str, int] = {}
+        self._open: set[str] = set()
+        self._skipped: dict[str, list[str]] = {}
+
+    def allow(self, url: str) -> bool:
+        """
+        Check whether a request to this URL's host may be made.
+
+        Args:
+            url (str): URL about to be requested.
+
+        Returns:
+            bool: False if the host's circuit is open (the URL is recorded as skipped).
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._open:
+                return True
+            self._skipped.setdefault(host, []).append(url)
+            return False
+
+    def is_open(self, url: str) -> bool:
+        """Check whether the URL's host circuit is open, without recording a skip."""
+        with self._lock:
+            return urlparse(url).netloc in self._open
+
+    def success(self, url: str) -> None:
+        with self._lock:
+            self._failures[urlparse(url).netloc] = 0
+
+    def failure(self, url: str) -> None:
+        host = urlparse(url).netloc
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._failures[host] >= self.threshold:
+                self._open.add(host)
+
+    def report(self) -> str:
+        """
+        Summarise hosts whose circuit opened this run.
+
+        Returns:
+            str: One line per unhealthy host with the number of URLs skipped,
+            or an empty string if every host was healthy.
+        """
+        with self._lock:
+            return "\n".join(
+                f"Skipped {len(self._skipped.get(host, []))} URL(s) from {host} "
+                f"after {self._failures[host]} consecutive failures."
+                for host in sorted(self._open)
+            )
+
+
+host_health = HostHealth()
@@ -0,0 +1,84 @@
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Prefer the C-backed lxml tree builder, fall back to the stdlib parser
+try:
+    import lxml  # noqa: F401
+    HTML_FEATURES = "lxml"
+except ImportError:
+    HTML_FEATURES = "html.parser"
+
+# selectolax is only used for link and text extraction, where no tree is kept
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# Only the parts of a page each scraper reads
+CONTENT_PAGE = SoupStrainer('article')
+PAGE_BODY = SoupStrainer('body')
+LINKS = SoupStrainer('a', href=True)
+
+
+def make_soup(
+        markup: str | bytes, parse_only: SoupStrainer | None = None,
+        encoding: str | None = None) -> BeautifulSoup:
+    """
+    Parse HTML with the fastest available BeautifulSoup tree builder.
+
+    Args:
+        markup (str | bytes): The HTML to parse.
+        parse_only (SoupStrainer | None): If given, only matching tags (and
+            their contents) are built into the tree.
+        encoding (str | None): Charset of `markup` when it is bytes. If None,
+            BeautifulSoup sniffs it from the document.
+
+    Returns:
+        BeautifulSoup: The parsed document.
+    """
+    if isinstance(markup, bytes) and encoding:
+        return BeautifulSoup(markup, HTML_FEATURES, parse_only=parse_only, from_encoding=encoding)
+    return BeautifulSoup(markup, HTML_FEATURES, parse_only=parse_only)
+
+
+def extract_links(markup: str | bytes, encoding: str | None = None) -> list[str]:
+    """
+    Return the `href` of every anchor in a page, in document order.
+
+    Uses selectolax when installed, otherwise a BeautifulSoup parse limited
+    to `<a href>` tags.
+
+    Args:
+        markup (str | bytes): The HTML of a listing page.
+        encoding (str | None): Charset of `markup` when it is bytes.
+
+    Returns:
+        list[str]: The raw `href` values.
+    """
+    if HTMLParser is not None:
+        if isinstance(markup, bytes) and encoding:
+            try:
+                markup = markup.decode(encoding, errors='replace')
+            except LookupError:
+                pass  # unknown charset name, let selectolax sniff it
+        tree = HTMLParser(markup)
+        return [node.attributes['href'] for node in tree.css('a[href]') if node.attributes['href']]
+
+    soup = make_soup(markup, LINKS, encoding)
+    return [anchor['href'] for anchor in soup.find_all('a') if anchor['href']]
+
+
+def html_to_text(markup: str | bytes) -> str:
+    """
+    Return the text of an HTML fragment, each string stripped and joined,
+    like `BeautifulSoup.get_text(strip=True)`.
+
+    Args:
+        markup (str | bytes): The HTML fragment.
+
+    Returns:
+        str: The extracted text.
+    """
+    if HTMLParser is not None:
+        return HTMLParser(markup).text(strip=True)
+
+    return make_soup(markup).get_text(strip=True)
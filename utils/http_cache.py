@@ -0,0 +1,185 @@
+from requests.structures import CaseInsensitiveDict
+import requests
+import hashlib
+import json
+import os
+import threading
+
+CACHE_DIR = "data/cache/http"
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+
+
+class HttpCache:
+    """
+    On-disk cache of HTTP response bodies and their validators.
+
+    Each URL is stored as two files named after the hash of the URL: a
+    small JSON file holding the ETag / Last-Modified validators and the
+    headers needed to rebuild the response, and the raw body bytes.
+    Only responses that carry a validator are cached, since without one
+    a conditional request can't be made. The total size of stored bodies
+    is kept as a running count; when it exceeds `max_bytes`, the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, path: str = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total: int | None = None  # bytes of stored bodies, None until first scanned
+
+    def _paths(self, url: str) -> tuple[str, str]:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return (
+            os.path.join(self.path, f"{key}.json"),
+            os.path.join(self.path, f"{key}.body")
+        )
+
+    def load(self, url: str) -> (tuple[dict, bytes] | None):
+        """
+        Load the cached entry for a URL.
+
+        Args:
+            url (str): The requested URL.
+
+        Returns:
+            (tuple[dict, bytes] | None): The entry metadata and body,
+            or None if the URL isn't cached.
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+            # Mark as recently used for eviction
+            os.utime(body_path)
+        except (OSError, ValueError):
+            return None
+        return meta, body
+
+    @staticmethod
+    def validators(meta: dict) -> dict:
+        """
+        Build conditional request headers from cached metadata.
+
+        Args:
+            meta (dict): Metadata returned by `load`.
+
+        Returns:
+            dict: `If-None-Match` / `If-Modified-Since` headers.
+        """
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    @staticmethod
+    def to_response(meta: dict, body: bytes, not_modified: requests.Response) -> requests.Response:
+        """
+        Rebuild a full response from a cache entry after a 304 reply.
+
+        Args:
+            meta (dict): Metadata returned by `load`.
+            body (bytes): Body returned by `load`.
+            not_modified (requests.Response): The 304 response from the server.
+
+        Returns:
+            requests.Response: A 200 response carrying the cached body.
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        response.encoding = meta.get('encoding')
+        response.url = meta.get('url', not_modified.url)
+        response.request = not_modified.request
+        response.from_cache = True
+        return response
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """
+        Save a successful response if it carries a validator.
+
+        Args:
+            url (str): The requested URL (the cache key).
+            response (requests.Response): A 200 response.
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified):
+            return
+
+        meta = {
+            'url': response.url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'encoding': response.encoding,
+            'headers': {
+                key: value for key, value in response.headers.items()
+                if key.lower() in ('content-type', 'etag', 'last-modified')
+            }
+        }
+
+        os.makedirs(self.path, exist_ok=True)
+        meta_path, body_path = self._paths(url)
+        try:
+            replaced = os.path.getsize(body_path)
+        except OSError:
+            replaced = 0
+        # Write to temp files first so readers never see a half-written entry
+        for path, data in (
+                (body_path, response.content),
+                (meta_path, json.dumps(meta).encode('utf-8'))):
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._total is not None:
+                self._total += len(response.content) - replaced
+            over = self._total is None or self._total > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove least recently used entries until the cache fits `max_bytes`.
+
+        Scans every entry, so it only runs when the running total is
+        unknown or over the cap, and resets the total from the scan.
+        """
+        with self._lock:
+            try:
+                names = os.listdir(self.path)
+            except OSError:
+                return
+
+            bodies = []
+            for name in names:
+                if not name.endswith('.body'):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.path, name))
+                except OSError:
+                    continue
+                bodies.append((stat.st_mtime, stat.st_size, name))
+
+            total = sum(size for _, size, _ in bodies)
+            for _, size, name in sorted(bodies):
+                if total <= self.max_bytes:
+                    break
+                key = name[:-len('.body')]
+                for suffix in ('.body', '.json'):
+                    try:
+                        os.remove(os.path.join(self.path, key + suffix))
+                    except OSError:
+                        pass
+                total -= size
+            self._total = total
+
+
+http_cache = HttpCache()
@@ -0,0 +1,197 @@
+from contextlib import contextmanager
+from datetime import datetime
+import bisect
+import json
+import math
+import os
+import threading
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+
+PROMETHEUS_PREFIX = "newsletter_"
+
+
+def _escape(value) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histogram:
+    """Cumulative-bucket histogram, in the Prometheus style."""
+
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[int]:
+        total, result = 0, []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+class Metrics:
+    """
+    Thread-safe run metrics: stage spans, counters and latency histograms.
+
+    Disabled by default; every recording method then returns after a
+    single attribute check, so instrumented hot paths (each request, each
+    parse) cost next to nothing. Series are identified by a name and
+    keyword labels, e.g. `metrics.inc("retries_total", source="safe_get")`.
+    Span seconds are summed over every entry, so stages run concurrently
+    by several workers can add up to more than the wall time.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = datetime.now()
+            self.spans: dict[str, list[float]] = {}
+            self.counters: dict[tuple, float] = {}
+            self.histograms: dict[tuple, Histogram] = {}
+
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+
+    @staticmethod
+    def _key(name: str, labels: dict[str, str]) -> tuple:
+        return (name, *sorted(labels.items()))
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        """Add `amount` to a counter."""
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record one value (seconds) in a histogram."""
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def add_span(self, stage: str, seconds: float) -> None:
+        """Add time spent in a pipeline stage."""
+        if not self.enabled:
+            return
+        with self._lock:
+            span = self.spans.setdefault(stage, [0.0, 0])
+            span[0] += seconds
+            span[1] += 1
+
+    @contextmanager
+    def span(self, stage: str):
+        """Time the block as part of a pipeline stage."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(stage, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        """All metrics as JSON-serialisable data."""
+        with self._lock:
+            return {
+                "started": self.started.isoformat(timespec='seconds'),
+                "stages": {
+                    stage: {"seconds": round(seconds, 4), "count": count}
+                    for stage, (seconds, count) in self.spans.items()
+                },
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, *labels), value in sorted(self.counters.items())
+                ],
+                "histograms": [
+                    {
+                        "name": name, "labels": dict(labels),
+                        "buckets": {
+                            ("+Inf" if bound == math.inf else str(bound)): count
+                            for bound, count in zip(BUCKETS, histogram.cumulative())
+                        },
+                        "sum": round(histogram.sum, 4), "count": histogram.count
+                    }
+                    for (name, *labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0])
+                ],
+            }
+
+    def prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format, for a node_exporter textfile."""
+        data = self.snapshot()
+
+        def series(name: str, labels: dict[str, str]) -> str:
+            if not labels:
+                return PROMETHEUS_PREFIX + name
+            escaped = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+            return f"{PROMETHEUS_PREFIX}{name}{{{escaped}}}"
+
+        lines = [f"# TYPE {PROMETHEUS_PREFIX}stage_seconds gauge"]
+        for stage, span in data["stages"].items():
+            lines.append(f"{series('stage_seconds', {'stage': stage})} {span['seconds']}")
+
+        typed = set()
+        for counter in data["counters"]:
+            if counter["name"] not in typed:
+                typed.add(counter["name"])
+                lines.append(f"# TYPE {PROMETHEUS_PREFIX}{counter['name']} counter")
+            lines.append(f"{series(counter['name'], counter['labels'])} {counter['value']}")
+
+        for histogram in data["histograms"]:
+            name = histogram["name"]
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {PROMETHEUS_PREFIX}{name} histogram")
+            for bound, count in histogram["buckets"].items():
+                lines.append(f"{series(name + '_bucket', {**histogram['labels'], 'le': bound})} {count}")
+            lines.append(f"{series(name + '_sum', histogram['labels'])} {histogram['sum']}")
+            lines.append(f"{series(name + '_count', histogram['labels'])} {histogram['count']}")
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """
+        Write the metrics to a file: Prometheus text if `path` ends in
+        `.prom`, JSON otherwise. The file is replaced atomically, so a
+        textfile collector never reads it half-written.
+
+        Args:
+            path (str): Output file.
+        """
+        if path.endswith(".prom"):
+            content = self.prometheus()
+        else:
+            content = json.dumps(self.snapshot(), indent=2) + "\n"
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp = f"{path}.tmp"
+        with open(temp, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp, path)
+
+
+metrics = Metrics()
@@ -0,0 +1,80 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Any
+from utils.metrics import metrics
+import atexit
+import multiprocessing
+import threading
+import time
+
+# > 0 parses pages in that many worker processes; 0 keeps parsing in the calling thread
+PARSE_PROCESSES = 0
+
+# Workers are started from a single-threaded server process, never forked
+# from the threaded fetch stage, whose locks (connection pools, sqlite,
+# tqdm) a forked child could inherit held
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_pool: ProcessPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def configure_parse_pool(processes: int = PARSE_PROCESSES) -> None:
+    """
+    Set how many worker processes parse HTML and create the pool. Call
+    from the main thread before fetching starts.
+
+    Args:
+        processes (int): Number of parse processes, or 0 to parse in-thread.
+    """
+    global _pool
+    shutdown_parse_pool()
+    if processes > 0:
+        with _lock:
+            _pool = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context(START_METHOD)
+            )
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the parse worker processes, if any were started."""
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def run_parse(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a CPU-bound parse function, in a worker process when the pool is enabled.
+
+    Fetch threads call this with the raw page bytes, so BeautifulSoup work
+    spreads across cores instead of contending for the GIL. `func` must be
+    a module-level function and its arguments and result picklable, so
+    extractors return compact records rather than soup objects.
+
+    Parse time (including any hand-off to a worker process) is recorded
+    under the "parse" stage.
+
+    Args:
+        func (Callable[..., Any]): The extractor to run.
+        *args (Any): Its arguments.
+
+    Returns:
+        Any: The extractor's result.
+    """
+    start = time.perf_counter()
+    try:
+        with _lock:
+            pool = _pool
+        if pool is None:
+            return func(*args)
+        return pool.submit(func, *args).result()
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.add_span("parse", elapsed)
+        metrics.observe("parse_seconds", elapsed, func=func.__name__)
+
+
+atexit.register(shutdown_parse_pool)
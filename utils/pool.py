@@ -0,0 +1,37 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Any
+
+ARTICLE_WORKERS = 8
+
+# Shared by every feed, so the total number of article scrapes in flight
+# stays bounded no matter how many feeds are processed at once. Kept
+# separate from the feed pool so feed workers waiting on it can't deadlock.
+_article_pool = ThreadPoolExecutor(max_workers=ARTICLE_WORKERS, thread_name_prefix="article")
+
+
+def map_isolated(func: Callable[..., Any], items: Iterable[Any], *args: Any) -> list[Any]:
+    """
+    Run `func(item, *args)` for each item on the shared article pool.
+
+    A failure in one call doesn't affect the others: any exception is
+    reported and that item's result becomes None, the same way
+    `safe_get` returns None for a page it couldn't fetch.
+
+    Args:
+        func (Callable[..., Any]): The function to call per item.
+        items (Iterable[Any]): Items to process.
+        *args (Any): Extra arguments passed to every call.
+
+    Returns:
+        list[Any]: Results in the same order as `items`.
+    """
+    futures = [_article_pool.submit(func, item, *args) for item in items]
+
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            print(f"Article scrape failed: {e}")
+            results.append(None)
+    return results
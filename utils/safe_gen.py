@@ -1,4 +1,5 @@
 from google.genai import errors
+from utils.metrics import metrics
 from typing import Callable, Any
 import time
 
@@ -23,5 +24,7 @@ def safe_gen(func: Callable[..., Any], *args: Any, retries: int = 3, wait: int =
         try:
             return func(*args)
         except errors.ServerError as e:
+            metrics.inc("retries_total", source="safe_gen", reason="server_error")
+            metrics.inc("sleep_seconds_total", wait, source="safe_gen")
             time.sleep(wait)
     raise RuntimeError("Max retries reached for AI call.")
@@ -1,16 +1,194 @@
+from utils.host_limit import host_limiter, host_health
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+from utils.http_cache import http_cache
+from utils.urls import url_aliases
+from utils.metrics import metrics
+from requests.adapters import HTTPAdapter
 import requests
+import feedparser
+import re
 import time
 
+try:
+    import brotli  # noqa: F401 - lets urllib3 decode `br` responses
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+USER_AGENT = "ellie-newsletter/0.1.1 (python-requests)"
+
+# Largest body read for a single page or feed
+MAX_BYTES = 5 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# Content types worth parsing; anything else is dropped before download
+MARKUP_TYPES = (
+    "text/html", "application/xhtml+xml", "text/xml", "application/xml",
+    "application/rss+xml", "application/atom+xml", "application/rdf+xml"
+)
+
+# Statuses that may carry a Retry-After header worth honouring
+RETRY_STATUSES = (429, 503)
+MAX_RETRY_AFTER = 60
+
+HEADER_CHARSET = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.IGNORECASE)
+XML_ENCODING = re.compile(rb'<\?xml[^>]+encoding=["\']([\w.:-]+)', re.IGNORECASE)
+
+
+def detect_charset(content_type: str, body: bytes) -> (str | None):
+    """
+    Work out a document's charset without guessing over the whole body.
+
+    Checks the Content-Type header, then a `<meta charset>` or XML
+    declaration in the first 2 KiB.
+
+    Args:
+        content_type (str): The Content-Type header value.
+        body (bytes): The document.
+
+    Returns:
+        (str | None): The declared charset, or None if none is declared
+        (parsers then sniff it themselves).
+    """
+    match = HEADER_CHARSET.search(content_type or "")
+    if match:
+        return match.group(1).lower()
+
+    head = body[:2048]
+    match = META_CHARSET.search(head) or XML_ENCODING.search(head)
+    if match:
+        return match.group(1).decode('ascii').lower()
+    return None
+
+
+def retry_after(response: requests.Response) -> (float | None):
+    """
+    Read a response's Retry-After header.
+
+    Args:
+        response (requests.Response): A 429 or 503 response.
+
+    Returns:
+        (float | None): Seconds to wait, capped at MAX_RETRY_AFTER, or None
+        if the header is missing or unreadable.
+    """
+    value = response.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def read_bounded(
+        response: requests.Response, max_bytes: int,
+        content_types: tuple[str, ...] = MARKUP_TYPES) -> bool:
+    """
+    Stream a response body into memory, refusing non-markup or oversized bodies.
+
+    On success the body is available as `response.content` and
+    `response.encoding` holds the declared charset (or None).
+
+    Args:
+        response (requests.Response): A response opened with `stream=True`.
+        max_bytes (int): Largest body accepted.
+        content_types (tuple[str, ...]): MIME types accepted.
+
+    Returns:
+        bool: True if the body was read, False if it was refused (the
+        connection is closed without downloading the rest).
+    """
+    content_type = response.headers.get("Content-Type", "")
+    mime = content_type.split(";")[0].strip().lower()
+    if mime and mime not in content_types:
+        response.close()
+        return False
+
+    length = response.headers.get("Content-Length")
+    if length and length.isdigit() and int(length) > max_bytes:
+        response.close()
+        return False
+
+    chunks, size = [], 0
+    for chunk in response.iter_content(CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            response.close()
+            return False
+        chunks.append(chunk)
+
+    body = b"".join(chunks)
+    response._content = body
+    response._content_consumed = True
+    response.encoding = detect_charset(content_type, body)
+    return True
+
+
+def make_session(pool_size: int = 16) -> requests.Session:
+    """
+    Create a requests.Session set up for the fetch stage.
+
+    Connections are kept alive and pooled per host, sized for the number
+    of concurrent workers, and responses are requested compressed.
+
+    Args:
+        pool_size (int): Connections kept open per host and number of host pools.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept-Encoding": ACCEPT_ENCODING,
+        "Connection": "keep-alive",
+    })
+    return session
+
+
 def safe_get(
         url: str, session: requests.Session, 
-        retries: int = 3, wait: int = 3) -> (requests.Response | None):
+        retries: int = 3, wait: int = 3,
+        use_cache: bool = True, max_bytes: int = MAX_BYTES,
+        content_types: tuple[str, ...] = MARKUP_TYPES) -> (requests.Response | None):
     """
     Safely perform an HTTP GET request with retries and exponential backoff.
 
     This function attempts to fetch the given URL using a provided
     requests.Session. Transient network errors (timeouts, connection errors)
     are retried with exponential backoff. Non-recoverable request errors
-    cause the request to be skipped.
+    cause the request to be skipped. Requests are counted against the
+    shared per-host limit so concurrent workers don't flood one host.
+
+    If the URL is in the HTTP cache, the request is made conditional
+    (`If-None-Match` / `If-Modified-Since`) and a 304 reply is answered
+    from the cached body.
+
+    Bodies are streamed: responses that aren't HTML or XML, or that are
+    larger than `max_bytes`, are abandoned without downloading the rest.
+    The charset is taken from the headers or the document's own declaration
+    rather than guessed, so callers should hand `response.content` and
+    `response.encoding` straight to the parser.
+
+    Hosts are tracked by a circuit breaker: once several URLs of a host
+    have failed in a row, each after using up its retries, the host's
+    remaining URLs are skipped for the rest of the run.
+    429 and 503 replies are retried after their `Retry-After` delay.
+
+    A followed redirect is recorded in `url_aliases`, so the linked and
+    final URLs count as the same article from then on, unless it leads
+    somewhere many URLs could (see `utils.urls.is_alias`).
 
     Args:
         url (str): The URL to request.
@@ -18,23 +196,100 @@ def safe_get(
             connections and headers.
         retries (int): Number of retry attempts for transient errors.
         wait (int): Base wait time in seconds for exponential backoff.
+        use_cache (bool): Whether to use and update the HTTP cache.
+        max_bytes (int): Largest body accepted.
+        content_types (tuple[str, ...]): MIME types accepted, HTML and XML by default.
 
     Returns:
         (requests.Response | None):
             The response object if the request succeeds, otherwise None
-            if all retries fail or a non-recoverable error occurs.
+            if all retries fail, a non-recoverable error occurs or the
+            body was refused.
     """
+    cached = http_cache.load(url) if use_cache else None
+    headers = http_cache.validators(cached[0]) if cached else {}
 
+    host = urlparse(url).netloc
     for attempt in range(retries):
+        if not host_health.allow(url):
+            metrics.inc("requests_skipped_total", host=host)
+            return None
+
         try:
-            response = session.get(url, timeout=10)
-            response.raise_for_status()
+            with host_limiter.limit(url):
+                start = time.perf_counter()
+                response = session.get(url, timeout=10, headers=headers, stream=True)
+                metrics.inc("requests_total", host=host, status=str(response.status_code))
+
+                if response.status_code == 304 and cached:
+                    response.close()
+                    host_health.success(url)
+                    metrics.observe("fetch_seconds", time.perf_counter() - start, host=host)
+                    return http_cache.to_response(*cached, response)
+
+                if response.status_code in RETRY_STATUSES and attempt < retries - 1:
+                    delay = retry_after(response)
+                    response.close()
+                    sleep = wait * 2**attempt if delay is None else delay
+                    metrics.inc("retries_total", source="safe_get", reason=str(response.status_code))
+                    metrics.inc("sleep_seconds_total", sleep, source="safe_get")
+                    time.sleep(sleep)
+                    continue
+
+                if response.status_code >= 500:
+                    host_health.failure(url)
+                response.raise_for_status()
+                if not read_bounded(response, max_bytes, content_types):
+                    return None
+                metrics.observe("fetch_seconds", time.perf_counter() - start, host=host)
+
+            host_health.success(url)
+            if response.url != url:
+                url_aliases.add(url, response.url)
+            if use_cache:
+                http_cache.store(url, response)
             return response
 
         except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-            time.sleep(wait * 2**attempt)
+            metrics.inc("request_errors_total", host=host, error=type(e).__name__)
+            if attempt < retries - 1 and not host_health.is_open(url):
+                metrics.inc("retries_total", source="safe_get", reason="network")
+                metrics.inc("sleep_seconds_total", wait * 2**attempt, source="safe_get")
+                time.sleep(wait * 2**attempt)
 
         except requests.exceptions.RequestException as e:
+            metrics.inc("request_errors_total", host=host, error=type(e).__name__)
             return None
 
-    return None
\ No newline at end of file
+    # Every attempt timed out or failed to connect: one failure for the host
+    host_health.failure(url)
+    return None
+
+
+def fetch_feed(url: str, session: requests.Session) -> (feedparser.FeedParserDict | None):
+    """
+    Fetch a feed through `safe_get` (and so the HTTP cache) and parse it.
+
+    Unlike `feedparser.parse(url)`, this uses the pooled session, its
+    timeout and the `safe_get` retry policy. The response headers are
+    passed on so feedparser can still use the declared charset. An
+    unchanged feed costs a single conditional request answered with 304.
+
+    Args:
+        url (str): The feed URL.
+        session (requests.Session): Active requests session for connection reuse.
+
+    Returns:
+        (feedparser.FeedParserDict | None): The parsed feed, or None if it
+        couldn't be fetched.
+    """
+    response = safe_get(url, session)
+    if response is None:
+        return None
+    return feedparser.parse(
+        response.content,
+        response_headers={
+            "content-type": response.headers.get("Content-Type", ""),
+            "content-location": response.url,
+        }
+    )
@@ -0,0 +1,160 @@
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import re
+import threading
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "cmp", "ocid", "smid", "ref", "ref_src", "at_medium", "at_campaign",
+    "at_custom1", "at_custom2", "at_custom3", "at_custom4", "amp", "outputtype"
+}
+TRACKING_PREFIXES = ("utm_", "at_", "mkt_", "pk_")
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+AMP_PATH = re.compile(r'(?:/amp/?|\.amp)$')
+
+# Link shorteners and feed proxies, the only hosts whose redirects to
+# another site are taken as aliases
+REDIRECTOR_HOSTS = {
+    "feedproxy.google.com", "feeds.feedburner.com", "t.co", "bit.ly", "ow.ly",
+    "trib.al", "dlvr.it", "buff.ly", "lnkd.in", "apple.news"
+}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalise a URL so that variants of the same page compare equal.
+
+    Forces https, lowercases the host and drops default ports, a `www.` or
+    `amp.` subdomain, AMP path suffixes, trailing slashes, fragments and
+    tracking query parameters. Remaining parameters are sorted.
+
+    Args:
+        url (str): The URL.
+
+    Returns:
+        str: The canonical form, meant as a comparison key rather than
+        for fetching.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS:
+        return url
+
+    host = re.sub(r'^(?:www|amp)\.', "", (parts.hostname or "").lower().rstrip("."))
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    path = parts.path
+    if path.startswith("/amp/"):
+        path = path[4:]
+    path = AMP_PATH.sub("", path).rstrip("/") or "/"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def is_alias(url: str, target: str) -> bool:
+    """
+    Check whether a redirect or `rel=canonical` target still looks like the
+    same article, rather than a page many URLs lead to.
+
+    Removed or paywalled articles often redirect to their section, a
+    subscription page or the homepage; aliasing those would make unrelated
+    articles compare equal. A target counts only if it isn't the site
+    root, an ancestor of the linked path (e.g. the section) or a top-level
+    page reached from a deeper one (e.g. `/subscribe`), and is on the same
+    site, unless the link is on a known redirector host.
+
+    Args:
+        url (str): The URL as linked.
+        target (str): Where it led.
+
+    Returns:
+        bool: True if `target` can stand for `url`.
+    """
+    source, destination = urlsplit(canonical_url(url)), urlsplit(canonical_url(target))
+    if destination.path == "/":
+        return False
+    if source.netloc != destination.netloc:
+        return source.netloc in REDIRECTOR_HOSTS
+    if destination.path.count("/") == 1 and source.path.count("/") > 1:
+        return False
+    return not source.path.startswith(destination.path + "/")
+
+
+class UrlAliases:
+    """
+    Thread-safe map from URLs to the canonical URL of the page they lead to.
+
+    Filled with final redirect targets (see `safe_get`) and `rel=canonical`
+    links found while scraping, so a feedproxy link and the article it
+    redirects to count as the same article. Targets that don't look like
+    the same article (see `is_alias`) are ignored. New aliases are
+    persisted by the article store.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._aliases: dict[str, str] = {}
+        self._pending: dict[str, str] = {}
+
+    def add(self, url: str, target: str | None) -> None:
+        """
+        Record that `url` is the same page as `target`.
+
+        Args:
+            url (str): The URL as linked (feed entry, listing page).
+            target (str | None): The redirect target or canonical URL.
+        """
+        if not target or not is_alias(url, target):
+            return
+        alias, key = canonical_url(url), self.resolve(target)
+        if alias == key:
+            return
+        with self._lock:
+            if self._aliases.get(alias) != key:
+                self._aliases[alias] = key
+                self._pending[alias] = key
+
+    def load(self, aliases: dict[str, str]) -> None:
+        """Add aliases read back from storage, except ones `is_alias` now refuses."""
+        with self._lock:
+            self._aliases.update(
+                (alias, key) for alias, key in aliases.items() if is_alias(alias, key)
+            )
+
+    def resolve(self, url: str) -> str:
+        """
+        The comparison key of a URL: its canonical form, followed through
+        any recorded alias.
+
+        Args:
+            url (str): The URL.
+
+        Returns:
+            str: The canonical URL of the page.
+        """
+        key = canonical_url(url)
+        with self._lock:
+            return self._aliases.get(key, key)
+
+    def take_pending(self) -> dict[str, str]:
+        """Aliases added since the last call, for saving."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+
+url_aliases = UrlAliases()